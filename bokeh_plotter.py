@@ -9,6 +9,8 @@ from bokeh.embed import file_html
 from bokeh.resources import CDN
 from bokeh.models import DatetimeTickFormatter
 
+from csv_chunk_common import read_table_file
+
 
 class PandasModel(QAbstractTableModel):
     def __init__(self, data):
@@ -85,12 +87,14 @@ class CSVViewer(QMainWindow):
 
     def loadCSV(self):
         options = QFileDialog.Options()
-        filePath, _ = QFileDialog.getOpenFileName(self, "Open CSV File", "", "CSV Files (*.csv);;All Files (*)",
+        filePath, _ = QFileDialog.getOpenFileName(self, "Open CSV File", "",
+                                                  "CSV Files (*.csv);;Parquet Files (*.parquet);;"
+                                                  "Feather Files (*.feather);;All Files (*)",
                                                   options=options)
 
         if filePath:
             try:
-                self.df = pd.read_csv(filePath, parse_dates=True)
+                self.df = read_table_file(filePath, parse_dates=True)
                 self.model = PandasModel(self.df)
                 self.tableView.setModel(self.model)
 
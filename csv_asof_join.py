@@ -0,0 +1,334 @@
+import argparse
+import os
+import sys
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from csv_chunk_common import (
+    COMPRESSION_EXTENSIONS, DEFAULT_MEMORY_BUDGET_MB, ChunkPlanner, CSVChunkWriter,
+    DatetimeParser, ProgressFile, output_extension, strip_data_extensions, to_datetime64_ns
+)
+from csv_time_index import read_csv_header
+
+
+JOIN_KEY_COLUMN = "__join_key_ns__"
+JOIN_DIRECTIONS = ["backward", "forward", "nearest"]
+DEFAULT_RIGHT_SUFFIX = "_right"
+
+_MISSING_KEY = np.iinfo(np.int64).min
+
+
+def joined_output_path(left_path, compression=None, output_dir=None):
+    """<left>_joined_<timestamp>.csv next to the left input, like the filter outputs."""
+    output_dir = output_dir or os.path.dirname(left_path)
+    input_name = strip_data_extensions(os.path.basename(left_path))
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    return os.path.join(output_dir, f"{input_name}_joined_{timestamp}{output_extension('CSV', compression)}")
+
+
+class _SortedKeyedChunks:
+    """
+    Text chunks of one time-sorted CSV with an int64 join key column added.
+
+    Rows without a parseable timestamp keep _MISSING_KEY; everything else
+    must be non-decreasing across the whole file, which is checked as the
+    chunks stream by.
+    """
+
+    def __init__(self, source, datetime_column, chunk_planner, label):
+        self.datetime_column = datetime_column
+        self.label = label
+        self._datetime_parser = DatetimeParser()
+        self._chunks = chunk_planner.read_csv(source.handle, dtype=str, keep_default_na=False)
+        self._last_key = _MISSING_KEY
+        self.rows_read = 0
+
+    def next_chunk(self):
+        """Next keyed chunk, or None at the end of the file."""
+        try:
+            chunk = next(self._chunks)
+        except StopIteration:
+            return None
+
+        if self.datetime_column not in chunk.columns:
+            raise ValueError(f"Column '{self.datetime_column}' not found in the {self.label} CSV.")
+
+        parsed = self._datetime_parser.parse(chunk[self.datetime_column])
+        keys = to_datetime64_ns(parsed)
+        valid = keys[keys != _MISSING_KEY]
+
+        if len(valid) and (valid[0] < self._last_key or (np.diff(valid) < 0).any()):
+            raise ValueError(
+                f"The {self.label} CSV is not sorted by '{self.datetime_column}' "
+                f"(around row {self.rows_read + 1}); sort it first."
+            )
+        if len(valid):
+            self._last_key = int(valid[-1])
+
+        chunk[JOIN_KEY_COLUMN] = keys
+        self.rows_read += len(chunk)
+        return chunk
+
+
+class _RightWindow:
+    """
+    The buffered slice of the right CSV that can still match left rows.
+
+    Rows are read ahead until they pass the left keys being joined and are
+    dropped once every remaining left key lies beyond them, so the window
+    only spans the overlap between the two files rather than either file.
+    """
+
+    def __init__(self, chunks, columns, by):
+        self._chunks = chunks
+        self.by = by
+        self.buffer = pd.DataFrame(columns=columns + [JOIN_KEY_COLUMN])
+        self.exhausted = False
+
+    def last_key(self):
+        return int(self.buffer[JOIN_KEY_COLUMN].iloc[-1]) if len(self.buffer) else None
+
+    def read_chunk(self):
+        """Append the next right chunk; False once the file is exhausted."""
+        chunk = self._chunks.next_chunk()
+        if chunk is None:
+            self.exhausted = True
+            return False
+
+        # Right rows without a timestamp can never match
+        chunk = chunk[chunk[JOIN_KEY_COLUMN] != _MISSING_KEY]
+        self.buffer = chunk if self.buffer.empty else pd.concat([self.buffer, chunk], ignore_index=True)
+        return True
+
+    def covered_rows(self, left, keys, direction, tolerance):
+        """
+        Length of the leading run of left rows whose match can no longer
+        change. Unread right rows all sort at or after the last buffered key,
+        so rows before it are settled, except that forward and nearest matches
+        within by groups also need a later row of their own group (or a
+        tolerance that rules the unread rows out).
+        """
+        if self.exhausted:
+            return len(left)
+
+        last_key = self.last_key()
+        if last_key is None:
+            return 0
+
+        # Rows without a timestamp travel with the keyed rows before them
+        ready = np.maximum.accumulate(keys) < last_key
+
+        if self.by and direction != "backward":
+            group_last = self.buffer.groupby(self.by, sort=False)[JOIN_KEY_COLUMN].max().rename("__last__")
+            reach = left[self.by].merge(group_last.reset_index(), on=self.by, how="left")["__last__"]
+            settled = (reach.to_numpy(dtype="float64") >= keys) | (keys == _MISSING_KEY)
+            if tolerance is not None:
+                settled |= keys + tolerance < last_key
+            ready &= settled
+
+        return len(left) if ready.all() else int(np.argmin(ready))
+
+    def drop_before(self, key, tolerance):
+        """Forget rows no left key >= key can match any more."""
+        keys = self.buffer[JOIN_KEY_COLUMN].to_numpy()
+        cut = int(np.searchsorted(keys, key, side="right"))
+        if cut == 0:
+            return
+
+        head = self.buffer.iloc[:cut]
+        if tolerance is not None:
+            head = head[head[JOIN_KEY_COLUMN] >= key - tolerance]
+
+        # A backward match only ever needs the latest earlier row (per group),
+        # including its ties
+        if not head.empty:
+            if self.by:
+                latest = head.groupby(self.by, sort=False)[JOIN_KEY_COLUMN].transform("max")
+                head = head[head[JOIN_KEY_COLUMN] == latest]
+            else:
+                head = head[head[JOIN_KEY_COLUMN] == head[JOIN_KEY_COLUMN].iloc[-1]]
+
+        self.buffer = pd.concat([head, self.buffer.iloc[cut:]], ignore_index=True)
+
+
+def _join_ready(left, right, by, tolerance, direction, suffix):
+    """merge_asof one slice of left rows against the right window, keeping left order."""
+    has_key = left[JOIN_KEY_COLUMN] != _MISSING_KEY
+    keyed = left[has_key]
+
+    right = right.astype({JOIN_KEY_COLUMN: "int64"})
+    joined = pd.merge_asof(
+        keyed.astype({JOIN_KEY_COLUMN: "int64"}), right, on=JOIN_KEY_COLUMN,
+        by=by or None, tolerance=tolerance, direction=direction, suffixes=("", suffix)
+    )
+    joined.index = keyed.index
+
+    if not has_key.all():
+        # Left rows without a timestamp are kept, unmatched, where they were
+        joined = pd.concat([joined, left[~has_key]]).sort_index()
+
+    return joined.drop(columns=JOIN_KEY_COLUMN)
+
+
+def asof_join_csv(left_path, right_path, output_path, left_on, right_on=None,
+                  tolerance=None, direction="backward", by=None, suffix=DEFAULT_RIGHT_SUFFIX,
+                  memory_budget_mb=DEFAULT_MEMORY_BUDGET_MB, compression=None,
+                  on_progress=None, on_status=None, should_stop=None):
+    """
+    As-of join two time-sorted CSVs of any size in one streaming pass.
+
+    Every left row gets the columns of the right row nearest in time in
+    direction ("backward" = latest at or before, "forward" = earliest at or
+    after, "nearest" = either), optionally only within tolerance (a pandas
+    Timedelta or string such as "5s") and only among right rows with equal
+    values in the by columns. Unmatched left rows keep empty right columns.
+
+    Left rows stream through in chunks sized from half of the memory
+    budget; the other half caps the window of right rows kept for them.
+    When the right file is much denser than the left, left chunks are
+    joined in slices so the window never has to hold more than its cap.
+    Both files must be sorted by their datetime columns (csv_external_sort
+    can do that); values are copied as text.
+
+    on_progress(percent, rows) and on_status(message) report progress and
+    should_stop() is polled to cancel. Returns a summary dict with
+    left_rows, right_rows, matched_rows, elapsed and cancelled.
+    """
+    on_progress = on_progress or (lambda percent, rows: None)
+    on_status = on_status or (lambda message: None)
+    should_stop = should_stop or (lambda: False)
+
+    if direction not in JOIN_DIRECTIONS:
+        raise ValueError(f"Unknown join direction '{direction}'.")
+
+    right_on = right_on or left_on
+    by = list(by or [])
+    tolerance_ns = pd.Timedelta(tolerance).value if tolerance is not None else None
+
+    left_columns, _ = read_csv_header(left_path)
+    right_columns, _ = read_csv_header(right_path)
+    if right_on not in right_columns:
+        raise ValueError(f"Column '{right_on}' not found in the right CSV.")
+
+    # Marks matched rows, since matched right values may themselves be empty
+    match_column = right_on + suffix if right_on in left_columns else right_on
+
+    started = time.monotonic()
+    left_planner = ChunkPlanner(memory_budget_mb / 2)
+    right_planner = ChunkPlanner(memory_budget_mb / 2)
+
+    summary = {"left_rows": 0, "right_rows": 0, "matched_rows": 0, "cancelled": False}
+    writer = CSVChunkWriter(output_path, compression)
+
+    def window_rows():
+        return max(int(right_planner.memory_budget / max(right_planner.bytes_per_row or 1, 1)), 1000)
+
+    try:
+        on_status(f"Joining {os.path.basename(right_path)} onto {os.path.basename(left_path)} ({direction})...")
+
+        with ProgressFile(left_path) as left_source, ProgressFile(right_path) as right_source:
+            left_chunks = _SortedKeyedChunks(left_source, left_on, left_planner, "left")
+            right_chunks = _SortedKeyedChunks(right_source, right_on, right_planner, "right")
+            window = _RightWindow(right_chunks, right_columns, by)
+            window_cap = window_rows()
+
+            while True:
+                if should_stop():
+                    summary["cancelled"] = True
+                    break
+
+                pending = left_chunks.next_chunk()
+                if pending is None:
+                    break
+
+                while not pending.empty:
+                    keys = pending[JOIN_KEY_COLUMN].to_numpy()
+                    valid = keys[keys != _MISSING_KEY]
+
+                    if len(valid) == 0:
+                        ready, pending = pending, pending.iloc[:0]
+                    else:
+                        window.drop_before(int(valid[0]), tolerance_ns)
+
+                        while True:
+                            cut = window.covered_rows(pending, keys, direction, tolerance_ns)
+                            if cut == len(pending) or len(window.buffer) >= window_cap:
+                                break
+                            window.read_chunk()
+
+                        if cut == 0:
+                            # The window is full before the first row settles: let it grow
+                            window_cap = len(window.buffer) * 2
+                            continue
+
+                        # With a full window, join the rows it already settles
+                        ready, pending = pending.iloc[:cut], pending.iloc[cut:]
+
+                    window_cap = window_rows()
+
+                    joined = _join_ready(ready, window.buffer, by, tolerance_ns, direction, suffix)
+                    writer.write(joined)
+
+                    summary["matched_rows"] += int(joined[match_column].notna().sum()) if match_column in joined else 0
+
+                summary["left_rows"] = left_chunks.rows_read
+                summary["right_rows"] = right_chunks.rows_read
+                on_progress(left_source.percent(), left_chunks.rows_read)
+
+        if summary["left_rows"] == 0 and not summary["cancelled"]:
+            # Header-only left input still gets the joined header
+            header = _join_ready(
+                pd.DataFrame(columns=left_columns + [JOIN_KEY_COLUMN]),
+                pd.DataFrame(columns=right_columns + [JOIN_KEY_COLUMN]),
+                by, tolerance_ns, direction, suffix
+            )
+            writer.write(header)
+
+        return summary
+
+    finally:
+        writer.close()
+        summary["elapsed"] = time.monotonic() - started
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="As-of join two time-sorted CSVs larger than memory on their datetime columns."
+    )
+    parser.add_argument("left", help="CSV whose rows are all kept (.csv, .csv.gz, .csv.bz2, .csv.xz).")
+    parser.add_argument("right", help="CSV whose nearest row in time is joined onto each left row.")
+    parser.add_argument("-c", "--column", required=True, help="Datetime column of the left CSV.")
+    parser.add_argument("--right-column", help="Datetime column of the right CSV; defaults to --column.")
+    parser.add_argument("-t", "--tolerance", help="Largest time gap for a match, e.g. 500ms, 5s, 1min.")
+    parser.add_argument("--direction", choices=JOIN_DIRECTIONS, default="backward", help="Which right rows may match.")
+    parser.add_argument("--by", nargs="+", help="Columns that must also be equal, e.g. a device id.")
+    parser.add_argument("--suffix", default=DEFAULT_RIGHT_SUFFIX, help="Suffix for right columns named like left ones.")
+    parser.add_argument("-o", "--output", help="Output CSV; defaults to <left>_joined_<timestamp>.csv.")
+    parser.add_argument("--compression", choices=list(COMPRESSION_EXTENSIONS.values()), help="Compress the output.")
+    parser.add_argument("--memory-budget", type=int, default=DEFAULT_MEMORY_BUDGET_MB, help="Memory cap for the join in MB.")
+    args = parser.parse_args(argv)
+
+    output_path = args.output or joined_output_path(args.left, args.compression)
+
+    try:
+        summary = asof_join_csv(
+            args.left, args.right, output_path, args.column, args.right_column,
+            tolerance=args.tolerance, direction=args.direction, by=args.by, suffix=args.suffix,
+            memory_budget_mb=args.memory_budget, compression=args.compression, on_status=print
+        )
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    print(
+        f"{args.left} + {args.right} -> {output_path}: {summary['left_rows']} rows, "
+        f"{summary['matched_rows']} matched in {summary['elapsed']:.1f}s"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,1356 @@
+import bz2
+import csv
+import gzip
+import io
+import json
+import lzma
+import os
+import shutil
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import numpy as np
+import pandas as pd
+
+try:
+    from pandas.tseries.api import guess_datetime_format
+except ImportError:  # pandas < 2.2
+    from pandas.core.tools.datetimes import guess_datetime_format
+
+
+EPOCH_NS_PER_UNIT = {
+    "s": 1_000_000_000,
+    "ms": 1_000_000,
+    "us": 1_000,
+    "ns": 1,
+}
+
+# Upper magnitude per unit: epoch seconds stay below 1e11 until year 5138,
+# so every unit gets its own 1000x band
+_EPOCH_UNIT_LIMITS = [("s", 1e11), ("ms", 1e14), ("us", 1e17)]
+
+
+def detect_epoch_unit(values, sample_size=1000):
+    """
+    Unit ("s", "ms", "us" or "ns") of a numeric epoch column guessed from the
+    magnitude of a sample, or None when the values are not all numbers.
+    """
+    sample = values.dropna().head(sample_size)
+    if sample.empty or pd.api.types.is_bool_dtype(sample):
+        return None
+
+    numeric = pd.to_numeric(sample, errors="coerce")
+    if numeric.isna().any():
+        # Empty text fields are gaps, anything else means it is not an epoch column
+        if (numeric.isna() & sample.astype(str).str.strip().ne("")).any():
+            return None
+        numeric = numeric.dropna()
+        if numeric.empty:
+            return None
+
+    magnitude = numeric.abs().median()
+    for unit, limit in _EPOCH_UNIT_LIMITS:
+        if magnitude < limit:
+            return unit
+    return "ns"
+
+
+def epoch_bounds(start_dt, end_dt, unit, integer=True):
+    """
+    start_dt and end_dt as epoch numbers in unit. Integer bounds are rounded
+    inwards so that raw >= low and raw <= high match the datetime comparison.
+    """
+    per_unit = EPOCH_NS_PER_UNIT[unit]
+    start_ns = pd.Timestamp(start_dt).value
+    end_ns = pd.Timestamp(end_dt).value
+
+    if integer:
+        return -(-start_ns // per_unit), end_ns // per_unit
+    return start_ns / per_unit, end_ns / per_unit
+
+
+def epoch_to_timestamp(value, unit):
+    if value is None or pd.isna(value):
+        return pd.NaT
+    return pd.Timestamp(value, unit=unit)
+
+
+class DatetimeParser:
+    """
+    Parse a datetime column chunk by chunk.
+
+    The format is inferred once from the first chunk and reused for every
+    later chunk, so pandas does not guess it again per chunk. When no single
+    format fits (mixed formats), parsing falls back to a bounded cache of
+    unique string -> timestamp, which pays off on log columns where the
+    same timestamp repeats across many rows.
+
+    Numeric epoch columns are detected once from the first chunk; their unit
+    is kept in epoch_unit so range filters can compare the raw numbers.
+    """
+
+    SAMPLE_SIZE = 1000
+
+    def __init__(self, datetime_format=None, cache_size=100000):
+        self.datetime_format = datetime_format
+        self.cache_size = cache_size
+        self.epoch_unit = None
+        self._inferred = datetime_format is not None
+        self._epoch_checked = datetime_format is not None
+        self._cache = OrderedDict()
+
+    def describe(self):
+        if self.epoch_unit:
+            return f"epoch '{self.epoch_unit}', compared as numbers"
+        if self.datetime_format:
+            return f"format '{self.datetime_format}'"
+        return "mixed formats, memoized parsing"
+
+    def detect_epoch(self, values):
+        """Epoch unit of the column, checked on the first chunk only."""
+        if not self._epoch_checked:
+            if not pd.api.types.is_datetime64_any_dtype(values):
+                self.epoch_unit = detect_epoch_unit(values, self.SAMPLE_SIZE)
+            self._epoch_checked = True
+
+        return self.epoch_unit
+
+    def parse(self, values):
+        if pd.api.types.is_datetime64_any_dtype(values):
+            return values
+
+        if self.detect_epoch(values):
+            return pd.to_datetime(
+                pd.to_numeric(values, errors="coerce"), unit=self.epoch_unit, errors="coerce"
+            )
+
+        if not pd.api.types.is_object_dtype(values) and not pd.api.types.is_string_dtype(values):
+            return pd.to_datetime(values, errors="coerce")
+
+        if not self._inferred:
+            self.datetime_format = self.infer_format(values)
+            self._inferred = True
+
+        if self.datetime_format:
+            return pd.to_datetime(values, format=self.datetime_format, errors="coerce")
+
+        return self._parse_memoized(values)
+
+    def infer_format(self, values):
+        """
+        Guess a format from the first non-null value and keep it only if it
+        parses the sample as well as pandas' own per-value inference does.
+        """
+        sample = values.dropna().astype(str).head(self.SAMPLE_SIZE)
+        if sample.empty:
+            return None
+
+        datetime_format = guess_datetime_format(sample.iloc[0])
+        if datetime_format is None:
+            return None
+
+        with_format = pd.to_datetime(sample, format=datetime_format, errors="coerce")
+        without_format = pd.to_datetime(sample, errors="coerce")
+
+        if with_format.isna().sum() > without_format.isna().sum():
+            return None
+
+        return datetime_format
+
+    def _parse_memoized(self, values):
+        codes, uniques = pd.factorize(values)
+
+        # Mostly unique values: the cache would only add overhead
+        if len(uniques) > len(values) // 2:
+            return pd.to_datetime(values, errors="coerce")
+
+        missing = [value for value in uniques if value not in self._cache]
+        if missing:
+            parsed = pd.to_datetime(pd.Series(missing, dtype=object), errors="coerce")
+            self._cache.update(zip(missing, parsed))
+
+        unique_timestamps = pd.DatetimeIndex([self._cache[value] for value in uniques])
+
+        # Log timestamps move forward, so dropping the oldest entries is enough
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+        # Codes of -1 mark nulls; appending NaT makes take() map them to NaT
+        lookup = unique_timestamps.append(pd.DatetimeIndex([pd.NaT]))
+        return pd.Series(lookup.take(codes), index=values.index, name=values.name)
+
+
+COMPRESSION_EXTENSIONS = {
+    ".gz": "gzip",
+    ".bz2": "bz2",
+    ".xz": "xz",
+}
+
+COMPRESSION_SUFFIXES = {compression: ext for ext, compression in COMPRESSION_EXTENSIONS.items()}
+
+_COMPRESSED_OPENERS = {
+    "gzip": gzip.open,
+    "bz2": bz2.open,
+    "xz": lzma.open,
+}
+
+
+def input_compression(file_path):
+    """Compression of a file from its extension, or None for plain files."""
+    return COMPRESSION_EXTENSIONS.get(os.path.splitext(file_path)[1].lower())
+
+
+def strip_data_extensions(file_name):
+    """"logs/run.csv.gz" -> "logs/run"."""
+    if input_compression(file_name):
+        file_name = os.path.splitext(file_name)[0]
+    return os.path.splitext(file_name)[0]
+
+
+def open_input(file_path):
+    """Binary handle yielding the decompressed bytes of a plain or compressed file."""
+    compression = input_compression(file_path)
+    if compression:
+        return _COMPRESSED_OPENERS[compression](file_path, "rb")
+    return open(file_path, "rb")
+
+
+def open_output_text(file_path, mode, compression=None):
+    """Text handle for writing CSV, stream-compressed when compression is set."""
+    if compression:
+        return _COMPRESSED_OPENERS[compression](
+            file_path, mode + "t", encoding="utf-8", newline=""
+        )
+    return open(file_path, mode, encoding="utf-8", newline="")
+
+
+class ByteRangeReader(io.RawIOBase):
+    """
+    Raw reader exposing only the [start, stop) byte ranges of a file, read
+    back to back. tell() counts from the first start, so with one range it
+    is the file position.
+    """
+
+    def __init__(self, file_path, ranges):
+        super().__init__()
+        self._file = open(file_path, "rb")
+        self._ranges = [(start, stop) for start, stop in ranges if stop > start]
+        self._origin = self._ranges[0][0] if self._ranges else 0
+        self._consumed = 0
+        self._remaining = 0
+        self._next_range()
+
+    def _next_range(self):
+        if not self._ranges:
+            return False
+
+        start, stop = self._ranges.pop(0)
+        self._file.seek(start)
+        self._remaining = stop - start
+        return True
+
+    def readable(self):
+        return True
+
+    def tell(self):
+        return self._origin + self._consumed
+
+    def readinto(self, buffer):
+        while self._remaining <= 0:
+            if not self._next_range():
+                return 0
+
+        data = self._file.read(min(len(buffer), self._remaining))
+        buffer[:len(data)] = data
+        self._remaining -= len(data)
+        self._consumed += len(data)
+        return len(data)
+
+    def close(self):
+        self._file.close()
+        super().close()
+
+
+def split_byte_ranges(file_path, data_offset, parts):
+    """
+    Split the data section of a CSV into roughly equal byte ranges whose
+    boundaries fall on line starts. Assumes no quoted field spans lines.
+    """
+    file_size = os.path.getsize(file_path)
+    parts = max(1, parts)
+    step = max(1, (file_size - data_offset) // parts)
+
+    boundaries = [data_offset]
+
+    with open(file_path, "rb") as f:
+        for i in range(1, parts):
+            position = data_offset + i * step
+            if position >= file_size:
+                break
+
+            f.seek(position - 1)
+            f.readline()
+            line_start = f.tell()
+
+            if boundaries[-1] < line_start < file_size:
+                boundaries.append(line_start)
+
+    boundaries.append(file_size)
+    return list(zip(boundaries[:-1], boundaries[1:]))
+
+
+def open_byte_range(file_path, start, stop):
+    """Buffered binary handle over a byte range, suitable for pd.read_csv."""
+    return io.BufferedReader(ByteRangeReader(file_path, [(start, stop)]))
+
+
+def open_byte_ranges(file_path, ranges):
+    """
+    Buffered binary handle over several line-aligned byte ranges, read as if
+    they were one file.
+    """
+    return io.BufferedReader(ByteRangeReader(file_path, ranges))
+
+
+class ProgressFile:
+    """
+    Binary input handle for pd.read_csv that reports progress from the
+    file position, so no separate pass is needed to count rows first.
+
+    Compressed inputs are decompressed on the fly and progress is measured
+    on the compressed bytes consumed. Plain files can be limited to the
+    byte range [start, stop), or to a list of line-aligned ranges.
+    """
+
+    def __init__(self, file_path, start=None, stop=None, ranges=None):
+        self.file_path = file_path
+        compression = input_compression(file_path)
+
+        if compression:
+            if start is not None or stop is not None or ranges is not None:
+                raise ValueError("Compressed input cannot be read by byte range.")
+
+            self._start = 0
+            self.total_bytes = os.path.getsize(file_path)
+            self._raw = open(file_path, "rb")
+            self.handle = _COMPRESSED_OPENERS[compression](self._raw, "rb")
+        elif ranges is not None:
+            self._start = ranges[0][0] if ranges else 0
+            self.total_bytes = sum(stop - start for start, stop in ranges)
+            self._raw = open_byte_ranges(file_path, ranges)
+            self.handle = self._raw
+        else:
+            self._start = start or 0
+            stop = os.path.getsize(file_path) if stop is None else stop
+            self.total_bytes = stop - self._start
+            self._raw = open_byte_range(file_path, self._start, stop)
+            self.handle = self._raw
+
+    def bytes_read(self):
+        return self._raw.tell() - self._start
+
+    def percent(self):
+        if self.total_bytes <= 0:
+            return 100
+        return min(int(self.bytes_read() / self.total_bytes * 100), 100)
+
+    def close(self):
+        if self.handle is not self._raw:
+            self.handle.close()
+        self._raw.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def worker_memory_budget(memory_budget_mb, workers):
+    """Each worker process holds its own chunk, so they split the budget."""
+    return max(memory_budget_mb // workers, 1)
+
+
+class ByteRangePool:
+    """
+    Runs a module-level function over newline-aligned byte ranges of a CSV
+    in a process pool. The file is cut into several ranges per worker, so
+    every core stays busy until the end, and each worker gets its share of
+    the memory budget.
+    """
+
+    RANGES_PER_WORKER = 4
+
+    def __init__(self, file_path, data_offset, workers, memory_budget_mb):
+        self.workers = workers
+        self.ranges = split_byte_ranges(
+            file_path, data_offset, workers * self.RANGES_PER_WORKER
+        )
+        self.worker_budget_mb = worker_memory_budget(memory_budget_mb, workers)
+        self.total_bytes = sum(stop - start for start, stop in self.ranges)
+        self.done_bytes = 0
+
+    def run(self, function, range_args, poll_interval=0.1):
+        """
+        Submit function(*args) for each entry of range_args, one per range in
+        self.ranges, and yield lists of (range_index, result) as they finish.
+        An empty list comes every poll_interval seconds so a GUI can stay
+        responsive; closing the generator early cancels ranges not started.
+        """
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            futures = {
+                executor.submit(function, *args): index
+                for index, args in enumerate(range_args)
+            }
+            pending = set(futures)
+
+            try:
+                while pending:
+                    done, pending = wait(
+                        pending, timeout=poll_interval, return_when=FIRST_COMPLETED
+                    )
+                    finished = []
+
+                    for future in done:
+                        index = futures[future]
+                        start, stop = self.ranges[index]
+                        finished.append((index, future.result()))
+                        self.done_bytes += stop - start
+
+                    yield finished
+            finally:
+                if pending:
+                    executor.shutdown(wait=False, cancel_futures=True)
+
+    def percent(self):
+        if self.total_bytes <= 0:
+            return 100
+        return min(int(self.done_bytes / self.total_bytes * 100), 100)
+
+
+def looks_time_sorted(sample_df, datetime_column):
+    """True when the parsed datetime column of a sample is non-decreasing."""
+    if sample_df is None or datetime_column not in sample_df.columns:
+        return False
+
+    values = DatetimeParser().parse(sample_df[datetime_column]).dropna()
+    return len(values) > 1 and values.is_monotonic_increasing
+
+
+class TimeOrderCheck:
+    """
+    Confirms a file is really time-sorted while it is read, since the sample
+    behind looks_time_sorted only covers its first rows. Each chunk must be
+    non-decreasing and must not start before the previous chunk ended; after
+    the first violation in_order stays False.
+    """
+
+    def __init__(self):
+        self.in_order = True
+        self.last_value = None
+
+    def observe(self, values):
+        """Check one chunk of parsed datetimes (or epoch numbers) in file order."""
+        if not self.in_order:
+            return False
+
+        values = pd.Series(values).dropna()
+
+        if values.empty:
+            return True
+
+        if not values.is_monotonic_increasing or (
+            self.last_value is not None and values.iloc[0] < self.last_value
+        ):
+            self.in_order = False
+        else:
+            self.last_value = values.iloc[-1]
+
+        return self.in_order
+
+
+def projected_columns(all_columns, selected_columns, datetime_column):
+    """
+    Columns to parse for a filter run: the selected output columns plus the
+    datetime column, kept in file order. Returns None when every column is
+    needed, which lets pd.read_csv skip projection entirely.
+    """
+    wanted = set(selected_columns) | {datetime_column}
+    usecols = [column for column in all_columns if column in wanted]
+
+    if not selected_columns or len(usecols) == len(all_columns):
+        return None
+
+    return usecols
+
+
+def parse_time_windows(text):
+    """
+    Parse one "start, end" window per line. Blank lines, "#" comments and a
+    leading header line (e.g. "start,end") are ignored.
+    """
+    windows = []
+
+    for line_number, row in enumerate(csv.reader(text.splitlines()), start=1):
+        if not row or not "".join(row).strip() or row[0].strip().startswith("#"):
+            continue
+
+        if len(row) < 2:
+            raise ValueError(f"Line {line_number}: expected 'start, end'.")
+
+        start = pd.to_datetime(row[0].strip(), errors="coerce")
+        end = pd.to_datetime(row[1].strip(), errors="coerce")
+
+        if pd.isna(start) or pd.isna(end):
+            if not windows and line_number == 1:
+                continue
+            raise ValueError(f"Line {line_number}: invalid datetime in '{','.join(row)}'.")
+
+        if start > end:
+            raise ValueError(f"Line {line_number}: start is after end.")
+
+        windows.append((start, end))
+
+    return windows
+
+
+def load_time_windows(file_path):
+    """Load windows from a JSON list of [start, end] pairs or a CSV/text file."""
+    with open(file_path, "r", encoding="utf-8") as f:
+        text = f.read()
+
+    if file_path.lower().endswith(".json"):
+        pairs = json.loads(text)
+        text = "\n".join(f"{start},{end}" for start, end in pairs)
+
+    return parse_time_windows(text)
+
+
+def to_datetime64_ns(timestamps):
+    """int64 nanoseconds for a datetime Series; NaT becomes the int64 minimum."""
+    return timestamps.to_numpy(dtype="datetime64[ns]").view("i8")
+
+
+class TimeWindowRouter:
+    """
+    Route rows to the (inclusive) time windows they fall in.
+
+    Windows are sorted by start, so each row finds its candidate window with
+    a binary search instead of being tested against every window. Earlier
+    windows are only revisited for rows a previous window could still cover,
+    which means disjoint windows need a single lookup per row.
+    """
+
+    def __init__(self, windows):
+        order = sorted(range(len(windows)), key=lambda i: windows[i][0])
+
+        self.window_order = np.array(order, dtype=np.int64)
+        self.starts = np.array([pd.Timestamp(windows[i][0]).value for i in order], dtype=np.int64)
+        self.ends = np.array([pd.Timestamp(windows[i][1]).value for i in order], dtype=np.int64)
+        self.prefix_max_end = np.maximum.accumulate(self.ends)
+        self.max_end = pd.Timestamp(int(self.prefix_max_end[-1]))
+
+    def route(self, timestamps):
+        """Return {window_index: row positions} for a datetime Series."""
+        values = to_datetime64_ns(timestamps)
+        positions = np.flatnonzero(~timestamps.isna().to_numpy())
+        values = values[positions]
+
+        candidates = np.searchsorted(self.starts, values, side="right") - 1
+        keep = candidates >= 0
+        positions, values, candidates = positions[keep], values[keep], candidates[keep]
+
+        routed = {}
+
+        while len(positions):
+            inside = values <= self.ends[candidates]
+            hit_positions = positions[inside]
+            hit_windows = candidates[inside]
+
+            order = np.argsort(hit_windows, kind="stable")
+            hit_positions = hit_positions[order]
+            hit_windows = hit_windows[order]
+
+            windows, first = np.unique(hit_windows, return_index=True)
+            for window, window_positions in zip(windows, np.split(hit_positions, first[1:])):
+                routed.setdefault(int(self.window_order[window]), []).append(window_positions)
+
+            # Step back only where an earlier window may still cover the row
+            previous = candidates - 1
+            more = previous >= 0
+            more[more] = self.prefix_max_end[previous[more]] >= values[more]
+            positions, values, candidates = positions[more], values[more], previous[more]
+
+        return {
+            window: np.sort(np.concatenate(parts))
+            for window, parts in routed.items()
+        }
+
+
+OUTPUT_FORMATS = {
+    "CSV": ".csv",
+    "Parquet": ".parquet",
+    "Feather": ".feather",
+}
+
+
+def _require_pyarrow(feature):
+    try:
+        import pyarrow
+    except ImportError:
+        raise ImportError(
+            f"{feature} requires pyarrow. Install it with: pip install pyarrow"
+        )
+    return pyarrow
+
+
+class CSVChunkWriter:
+    """
+    Append DataFrame chunks to a CSV file, writing the header once. With a
+    compression set, the output is written as a single compressed stream.
+    With append=True an existing non-empty file is extended without a new
+    header; compressed output then gains another stream member.
+    """
+
+    def __init__(self, path, compression=None, append=False):
+        self.path = path
+        self.compression = compression
+        self.rows_written = 0
+        self.chunks_written = 0
+        self._appending = append and os.path.exists(path) and os.path.getsize(path) > 0
+        self._handle = None
+
+    def _header_written(self):
+        return self._appending or self.chunks_written > 0
+
+    def _ensure_open(self):
+        if self._handle is None:
+            mode = "a" if self._header_written() else "w"
+            self._handle = open_output_text(self.path, mode, self.compression)
+
+    def write(self, df):
+        self._ensure_open()
+        df.to_csv(self._handle, index=False, header=not self._header_written())
+        self.rows_written += len(df)
+        self.chunks_written += 1
+
+    def append_part(self, part_path):
+        """Append an uncompressed part file written by another CSVChunkWriter."""
+        self._ensure_open()
+
+        with open(part_path, "r", encoding="utf-8", newline="") as part_file:
+            if self._header_written():
+                part_file.readline()
+            shutil.copyfileobj(part_file, self._handle, 1024 * 1024)
+
+        self.chunks_written += 1
+
+    def close(self):
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+
+
+class ArrowChunkWriter:
+    """
+    Base for columnar sinks. Chunked reads can type a column differently
+    from one chunk to the next (empty in the first chunk, text later), so
+    the schema grows as chunks arrive: compatible types are promoted
+    (null -> string, int64 -> double) and anything else falls back to
+    string. Widening rewrites what was already written into the new schema,
+    which only happens the few times a column's type actually changes.
+    """
+
+    output_format = None
+
+    def __init__(self, path):
+        self.pa = _require_pyarrow(f"{self.output_format} output")
+        self.path = path
+        self.schema = None
+        self.rows_written = 0
+        self.chunks_written = 0
+        self._writer = None
+
+    def _open(self, schema):
+        raise NotImplementedError
+
+    def _iter_part_batches(self, part_path):
+        raise NotImplementedError
+
+    def _widened_schema(self, schema):
+        pa = self.pa
+        incoming = {field.name: field for field in schema}
+        fields = []
+
+        for field in self.schema:
+            other = incoming.get(field.name)
+            if other is None or other.type == field.type:
+                fields.append(field)
+                continue
+
+            try:
+                fields.append(pa.unify_schemas(
+                    [pa.schema([field]), pa.schema([other])], promote_options="permissive"
+                ).field(0))
+            except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+                fields.append(pa.field(field.name, pa.large_string()))
+
+        return pa.schema(fields)
+
+    def _rewrite(self, schema):
+        """Reopen the output with schema and copy the batches written so far."""
+        self._writer.close()
+
+        previous_path = self.path + ".widening"
+        os.replace(self.path, previous_path)
+
+        self.schema = schema
+        self._writer = self._open(schema)
+
+        try:
+            for batch in self._iter_part_batches(previous_path):
+                self._writer.write_table(self.pa.Table.from_batches([batch]).cast(schema))
+        finally:
+            os.remove(previous_path)
+
+    def write_table(self, table):
+        # pandas metadata would describe the first chunk's dtypes only
+        table = table.replace_schema_metadata(None)
+
+        if self._writer is None:
+            self.schema = table.schema
+            self._writer = self._open(table.schema)
+        elif not table.schema.equals(self.schema):
+            schema = self._widened_schema(table.schema)
+            if not schema.equals(self.schema):
+                self._rewrite(schema)
+            table = table.select(self.schema.names).cast(self.schema)
+
+        self._writer.write_table(table)
+        self.rows_written += table.num_rows
+        self.chunks_written += 1
+
+    def write(self, df):
+        self.write_table(self.pa.Table.from_pandas(df, preserve_index=False))
+
+    def append_part(self, part_path):
+        """Stream the batches of a part file in the same format into this file."""
+        for batch in self._iter_part_batches(part_path):
+            self.write_table(self.pa.Table.from_batches([batch]))
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+
+class ParquetChunkWriter(ArrowChunkWriter):
+    """One Parquet row group per written chunk."""
+
+    output_format = "Parquet"
+
+    def _open(self, schema):
+        import pyarrow.parquet as pq
+        return pq.ParquetWriter(self.path, schema)
+
+    def _iter_part_batches(self, part_path):
+        import pyarrow.parquet as pq
+        return pq.ParquetFile(part_path).iter_batches()
+
+
+class FeatherChunkWriter(ArrowChunkWriter):
+    """Feather (Arrow IPC file) with one record batch per written chunk."""
+
+    output_format = "Feather"
+
+    def _open(self, schema):
+        return self.pa.ipc.new_file(self.path, schema)
+
+    def _iter_part_batches(self, part_path):
+        with self.pa.memory_map(part_path) as source:
+            reader = self.pa.ipc.open_file(source)
+            for i in range(reader.num_record_batches):
+                yield reader.get_batch(i)
+
+
+CHUNK_WRITERS = {
+    "CSV": CSVChunkWriter,
+    "Parquet": ParquetChunkWriter,
+    "Feather": FeatherChunkWriter,
+}
+
+
+def open_chunk_writer(path, output_format="CSV", compression=None):
+    """
+    Writer for the given format. Compression only applies to CSV; Parquet
+    and Feather already compress internally.
+    """
+    if output_format == "CSV":
+        return CSVChunkWriter(path, compression)
+    return CHUNK_WRITERS[output_format](path)
+
+
+def output_extension(output_format, compression=None):
+    extension = OUTPUT_FORMATS[output_format]
+    if output_format == "CSV" and compression:
+        extension += COMPRESSION_SUFFIXES[compression]
+    return extension
+
+
+class CompressionOptionsMixin:
+    """
+    Output format and CSV compression handling shared by the GUI filter
+    apps. Expects output_format_combo and compression_combo widgets.
+    """
+
+    def update_compression_state(self, output_format):
+        # Parquet and Feather compress internally
+        self.compression_combo.setEnabled(output_format == "CSV")
+
+    def selected_compression(self):
+        if self.output_format_combo.currentText() != "CSV":
+            return None
+
+        compression = self.compression_combo.currentText()
+        return None if compression == "None" else compression
+
+
+def with_output_extension(path, output_format, compression=None):
+    return strip_data_extensions(path) + output_extension(output_format, compression)
+
+
+PARTITION_PERIODS = ["None", "Hour", "Day", "Week"]
+
+_PARTITION_LABELS = {
+    "Hour": "%Y%m%d_%H",
+    "Day": "%Y%m%d",
+    "Week": "%G_W%V",
+}
+
+
+def partition_starts(timestamps, period):
+    """Start of the hour, day or ISO week (Monday) each timestamp falls in."""
+    if period == "Week":
+        days = timestamps.dt.floor("D")
+        return days - pd.to_timedelta(days.dt.dayofweek, unit="D")
+    return timestamps.dt.floor("h" if period == "Hour" else "D")
+
+
+class PartitionedChunkWriter:
+    """
+    Split chunks by hour, day or week of the datetime column into one file
+    per partition under output_dir, in the same pass that filters them.
+
+    At most max_open_files partition writers stay open; the least recently
+    used one is closed when another partition needs a handle. Reopened CSV
+    partitions are appended to; Parquet and Feather files cannot be
+    extended, so a reopened partition continues in a numbered file.
+    """
+
+    def __init__(self, output_dir, base_name, datetime_column, period,
+                 output_format="CSV", compression=None, max_open_files=64):
+        self.output_dir = output_dir
+        self.base_name = base_name
+        self.datetime_column = datetime_column
+        self.period = period
+        self.output_format = output_format
+        self.compression = compression
+        self.max_open_files = max(1, max_open_files)
+        self.extension = output_extension(output_format, compression)
+        self.rows_written = 0
+        self.chunks_written = 0
+        self.partition_rows = {}
+        self.partition_files = {}
+        self._datetime_parser = DatetimeParser()
+        self._open_writers = OrderedDict()
+
+    def write(self, df):
+        if df.empty:
+            return
+
+        timestamps = self._datetime_parser.parse(df[self.datetime_column])
+        codes, starts = pd.factorize(partition_starts(timestamps, self.period))
+
+        for code, part in df.groupby(codes, sort=False):
+            # Unparseable timestamps have no partition
+            if code < 0:
+                continue
+
+            label = starts[code].strftime(_PARTITION_LABELS[self.period])
+            self._writer_for(label).write(part)
+            self.partition_rows[label] = self.partition_rows.get(label, 0) + len(part)
+            self.rows_written += len(part)
+
+        self.chunks_written += 1
+
+    def _writer_for(self, label):
+        writer = self._open_writers.get(label)
+        if writer is not None:
+            self._open_writers.move_to_end(label)
+            return writer
+
+        while len(self._open_writers) >= self.max_open_files:
+            _, evicted = self._open_writers.popitem(last=False)
+            evicted.close()
+
+        files = self.partition_files.setdefault(label, [])
+
+        if self.output_format == "CSV" and files:
+            writer = CSVChunkWriter(files[0], self.compression, append=True)
+        else:
+            suffix = f"_{len(files) + 1:03d}" if files else ""
+            path = os.path.join(
+                self.output_dir, f"{self.base_name}_{label}{suffix}{self.extension}"
+            )
+            os.makedirs(self.output_dir, exist_ok=True)
+            files.append(path)
+            writer = open_chunk_writer(path, self.output_format, self.compression)
+
+        self._open_writers[label] = writer
+        return writer
+
+    def close(self):
+        while self._open_writers:
+            _, writer = self._open_writers.popitem(last=False)
+            writer.close()
+
+
+RESAMPLE_FREQUENCIES = ["None", "1s", "10s", "1min", "5min", "15min", "1h", "1D"]
+RESAMPLE_AGGREGATIONS = ["mean", "sum", "min", "max", "count", "first", "last"]
+# How far a row may trail the newest timestamp and still reach its bucket
+DEFAULT_RESAMPLE_LATENESS = "1h"
+
+# Partial statistics kept per bucket, and how two partials of a bucket combine
+_RESAMPLE_STATS = {
+    "mean": ["sum", "count"],
+    "sum": ["sum"],
+    "min": ["min"],
+    "max": ["max"],
+    "count": ["count"],
+    "first": ["first"],
+    "last": ["last"],
+}
+_COMBINE_STATS = {
+    "sum": "sum",
+    "count": "sum",
+    "min": "min",
+    "max": "max",
+    "first": "first",
+    "last": "last",
+}
+
+
+class StreamingResampler:
+    """
+    Resample rows into fixed time buckets while they stream past.
+
+    Each chunk is reduced to per-bucket partial statistics (sum and count for
+    a mean) and merged with the partials carried over from earlier chunks,
+    so a bucket split across a chunk boundary comes out whole. Buckets are
+    returned once they end before a watermark, the newest timestamp seen
+    minus allowed_lateness, so memory stays bounded whether or not the file
+    is sorted; rows that trail by less than that still reach their bucket.
+    Buckets without rows are not emitted.
+
+    A row behind the watermark would reopen a bucket already returned, so it
+    is left out and counted in late_rows instead of writing that bucket
+    twice.
+    """
+
+    def __init__(self, datetime_column, frequency, aggregation="mean",
+                 value_columns=None, allowed_lateness=DEFAULT_RESAMPLE_LATENESS):
+        if aggregation not in _RESAMPLE_STATS:
+            raise ValueError(f"Unknown aggregation '{aggregation}'.")
+
+        self.datetime_column = datetime_column
+        self.frequency = frequency
+        self.aggregation = aggregation
+        self.value_columns = value_columns
+        self.allowed_lateness = pd.Timedelta(allowed_lateness)
+        self.late_rows = 0
+        self._datetime_parser = DatetimeParser()
+        self._partials = None
+        self._newest = None
+        self._watermark = None
+
+    def add(self, chunk):
+        """Fold a chunk in and return the buckets it completed."""
+        if chunk.empty:
+            return self._empty_result()
+
+        if self.value_columns is None:
+            self.value_columns = [
+                column for column in chunk.select_dtypes("number").columns
+                if column != self.datetime_column
+            ]
+
+        timestamps = self._datetime_parser.parse(chunk[self.datetime_column])
+        buckets = timestamps.dt.floor(self.frequency)
+        valid = buckets.notna().to_numpy()
+
+        if self._watermark is not None:
+            late = valid & (buckets < self._watermark).to_numpy()
+            self.late_rows += int(late.sum())
+            valid = valid & ~late
+
+        if not valid.any():
+            return self._empty_result()
+
+        newest = timestamps[valid].max()
+        if self._newest is None or newest > self._newest:
+            self._newest = newest
+
+        values = chunk.loc[valid, self.value_columns].apply(pd.to_numeric, errors="coerce")
+        stats = _RESAMPLE_STATS[self.aggregation]
+        partials = values.groupby(buckets[valid].to_numpy()).agg(stats)
+
+        if self._partials is not None:
+            partials = pd.concat([self._partials, partials]).groupby(level=0).agg(
+                {key: _COMBINE_STATS[key[1]] for key in partials.columns}
+            )
+
+        watermark = (self._newest - self.allowed_lateness).floor(self.frequency)
+        if self._watermark is None or watermark > self._watermark:
+            self._watermark = watermark
+
+        complete = partials.index < self._watermark
+        self._partials = partials[~complete]
+        return self._finalize(partials[complete])
+
+    def finish(self):
+        """Return every bucket still open."""
+        partials, self._partials = self._partials, None
+        if partials is None:
+            return self._empty_result()
+        return self._finalize(partials.sort_index())
+
+    def _finalize(self, partials):
+        result = pd.DataFrame(index=partials.index)
+
+        for column in self.value_columns:
+            if self.aggregation == "mean":
+                result[column] = partials[(column, "sum")] / partials[(column, "count")]
+            else:
+                result[column] = partials[(column, self.aggregation)]
+
+        result.index.name = self.datetime_column
+        return result.reset_index()
+
+    def _empty_result(self):
+        return pd.DataFrame(columns=[self.datetime_column] + list(self.value_columns or []))
+
+
+class ResamplingChunkWriter:
+    """Writer wrapper that resamples chunks before handing them to writer."""
+
+    def __init__(self, writer, resampler):
+        self.writer = writer
+        self.resampler = resampler
+        self.rows_written = 0
+        self.chunks_written = 0
+
+    def write(self, df):
+        self._forward(self.resampler.add(df))
+        self.chunks_written += 1
+
+    def _forward(self, buckets):
+        if not buckets.empty:
+            self.writer.write(buckets)
+            self.rows_written += len(buckets)
+
+    def close(self):
+        buckets = self.resampler.finish()
+        self._forward(buckets)
+
+        if self.writer.chunks_written == 0:
+            # Nothing in range, still produce a header-only file
+            self.writer.write(buckets)
+
+        self.writer.close()
+
+
+def read_table_file(file_path, **csv_kwargs):
+    """Load a CSV, Parquet or Feather file depending on its extension."""
+    extension = os.path.splitext(file_path)[1].lower()
+
+    if extension == ".parquet":
+        return pd.read_parquet(file_path)
+
+    if extension in (".feather", ".arrow"):
+        return pd.read_feather(file_path)
+
+    return pd.read_csv(file_path, **csv_kwargs)
+
+
+DEFAULT_MEMORY_BUDGET_MB = 256
+
+
+class ChunkPlanner:
+    """
+    Pick chunk sizes that keep each parsed chunk within a memory budget.
+
+    Bytes per row are measured on an evenly spaced sample of every chunk and
+    smoothed, so the chunk size follows the row width of the file instead of
+    a hardcoded row count. The budget covers the parsed chunk only; filtering
+    and writing add roughly one more copy of the matching rows.
+    """
+
+    SAMPLE_ROWS = 1000
+
+    def __init__(self, memory_budget_mb=DEFAULT_MEMORY_BUDGET_MB, initial_rows=10000,
+                 min_rows=1000, max_rows=5000000):
+        self.memory_budget = int(memory_budget_mb * 1024 * 1024)
+        self.min_rows = min_rows
+        self.max_rows = max_rows
+        self.chunk_rows = initial_rows
+        self.bytes_per_row = None
+
+    def observe(self, chunk):
+        rows = len(chunk)
+        if rows == 0:
+            return
+
+        step = max(rows // self.SAMPLE_ROWS, 1)
+        sample = chunk.iloc[::step]
+        measured = sample.memory_usage(deep=True, index=False).sum() / max(len(sample), 1)
+
+        if self.bytes_per_row is None:
+            self.bytes_per_row = measured
+        else:
+            self.bytes_per_row = 0.7 * self.bytes_per_row + 0.3 * measured
+
+        planned = int(self.memory_budget / max(self.bytes_per_row, 1))
+        self.chunk_rows = min(max(planned, self.min_rows), self.max_rows)
+
+    def arrow_block_size(self):
+        # Arrow batches decode to roughly twice their CSV size
+        return min(max(self.memory_budget // 2, 1024 * 1024), 256 * 1024 * 1024)
+
+    def iter_chunks(self, reader):
+        """Pull chunks from a pd.read_csv(..., chunksize=...) reader at the planned size."""
+        while True:
+            try:
+                chunk = reader.get_chunk(self.chunk_rows)
+            except StopIteration:
+                return
+
+            self.observe(chunk)
+            yield chunk
+
+    def read_csv(self, handle, **read_options):
+        reader = pd.read_csv(handle, chunksize=self.chunk_rows, **read_options)
+        return self.iter_chunks(reader)
+
+
+CSV_ENGINES = ["pandas", "pyarrow"]
+
+
+def iter_pandas_filtered_chunks(handle, datetime_column, start_dt, end_dt,
+                                usecols=None, column_names=None, chunk_planner=None,
+                                datetime_parser=None, order_check=None):
+    """
+    Read a CSV with pd.read_csv in chunks and keep rows between start_dt and
+    end_dt. Yields (rows_read, chunk_min, filtered_chunk); chunk_min lets
+    callers stop early on time-sorted files, and an optional TimeOrderCheck
+    sees every chunk's datetimes before it is yielded.
+    """
+    datetime_parser = datetime_parser or DatetimeParser()
+    chunk_planner = chunk_planner or ChunkPlanner()
+    read_options = {"header": None, "names": column_names} if column_names else {}
+
+    for chunk in chunk_planner.read_csv(handle, usecols=usecols, **read_options):
+        if datetime_column not in chunk.columns:
+            raise ValueError(f"Column '{datetime_column}' not found in chunk.")
+
+        epoch_unit = datetime_parser.detect_epoch(chunk[datetime_column])
+
+        if epoch_unit:
+            # Bounds move into the column's unit; the rows are never converted
+            values = chunk[datetime_column]
+            if not pd.api.types.is_numeric_dtype(values):
+                values = pd.to_numeric(values, errors="coerce")
+
+            low, high = epoch_bounds(
+                start_dt, end_dt, epoch_unit, pd.api.types.is_integer_dtype(values)
+            )
+
+            if order_check is not None:
+                order_check.observe(values)
+
+            yield (
+                len(chunk),
+                epoch_to_timestamp(values.min(), epoch_unit),
+                chunk[(values >= low) & (values <= high)]
+            )
+            continue
+
+        chunk[datetime_column] = datetime_parser.parse(chunk[datetime_column])
+
+        if order_check is not None:
+            order_check.observe(chunk[datetime_column])
+
+        filtered_chunk = chunk[
+            (chunk[datetime_column] >= start_dt) &
+            (chunk[datetime_column] <= end_dt)
+        ]
+
+        yield len(chunk), chunk[datetime_column].min(), filtered_chunk
+
+
+def iter_arrow_filtered_chunks(handle, datetime_column, start_dt, end_dt,
+                               usecols=None, column_names=None, chunk_planner=None,
+                               datetime_parser=None, order_check=None):
+    """
+    Same contract as iter_pandas_filtered_chunks, but record batches are
+    parsed by Arrow's multithreaded CSV reader and the range predicate runs
+    as compute kernels. Only the matching rows become a DataFrame.
+
+    The datetime column is read as text and parsed with the format inferred
+    by DatetimeParser when Arrow's strptime handles it; otherwise (e.g.
+    fractional seconds) that column alone goes through pandas.
+    """
+    pa = _require_pyarrow("The pyarrow CSV engine")
+    import pyarrow.compute as pc
+    import pyarrow.csv as pa_csv
+
+    datetime_parser = datetime_parser or DatetimeParser()
+    chunk_planner = chunk_planner or ChunkPlanner()
+
+    read_options = pa_csv.ReadOptions(
+        use_threads=True,
+        block_size=chunk_planner.arrow_block_size(),
+        column_names=column_names
+    )
+    convert_options = pa_csv.ConvertOptions(
+        include_columns=usecols or [],
+        column_types={datetime_column: pa.string()}
+    )
+    # An index or zone map that selects no blocks leaves nothing to read, which
+    # open_csv rejects as an empty file; the caller then writes just the header
+    peek = getattr(handle, "peek", None)
+    if column_names and peek is not None and not peek(1):
+        return
+
+    reader = pa_csv.open_csv(handle, read_options=read_options, convert_options=convert_options)
+
+    if datetime_column not in reader.schema.names:
+        raise ValueError(f"Column '{datetime_column}' not found in CSV.")
+
+    timestamp_type = pa.timestamp("ns")
+    start = pa.scalar(pd.Timestamp(start_dt).value, pa.int64()).cast(timestamp_type)
+    end = pa.scalar(pd.Timestamp(end_dt).value, pa.int64()).cast(timestamp_type)
+    use_strptime = None
+    epoch_unit = None
+
+    for batch in reader:
+        table = pa.Table.from_batches([batch])
+        column_index = table.schema.get_field_index(datetime_column)
+        raw = table.column(column_index)
+
+        if use_strptime is None:
+            epoch_unit = datetime_parser.detect_epoch(
+                raw.slice(0, DatetimeParser.SAMPLE_SIZE).to_pandas()
+            )
+            use_strptime = not epoch_unit and _arrow_strptime_matches(raw, datetime_parser, pc)
+
+        if epoch_unit:
+            numbers = _arrow_epoch_numbers(raw, pa)
+            table = table.set_column(column_index, datetime_column, numbers)
+
+            low, high = epoch_bounds(
+                start_dt, end_dt, epoch_unit, pa.types.is_integer(numbers.type)
+            )
+            mask = pc.and_(
+                pc.greater_equal(numbers, pa.scalar(low, numbers.type)),
+                pc.less_equal(numbers, pa.scalar(high, numbers.type))
+            )
+
+            if order_check is not None:
+                order_check.observe(numbers.to_pandas())
+
+            yield (
+                batch.num_rows,
+                epoch_to_timestamp(pc.min(numbers).as_py(), epoch_unit),
+                table.filter(mask).to_pandas()
+            )
+            continue
+
+        if use_strptime:
+            timestamps = pc.strptime(
+                raw,
+                format=datetime_parser.datetime_format,
+                unit="ns",
+                error_is_null=True
+            )
+        else:
+            parsed = datetime_parser.parse(raw.to_pandas())
+            timestamps = pa.array(to_datetime64_ns(parsed).view("datetime64[ns]"), mask=parsed.isna().to_numpy())
+
+        table = table.set_column(column_index, datetime_column, timestamps)
+
+        mask = pc.and_(
+            pc.greater_equal(timestamps, start),
+            pc.less_equal(timestamps, end)
+        )
+        batch_min = pc.min(timestamps).as_py()
+
+        if order_check is not None:
+            order_check.observe(timestamps.to_pandas())
+
+        yield (
+            batch.num_rows,
+            pd.NaT if batch_min is None else pd.Timestamp(batch_min),
+            table.filter(mask).to_pandas()
+        )
+
+
+def _arrow_epoch_numbers(raw, pa):
+    """Epoch text column as int64, or float64 when it has decimals or gaps."""
+    try:
+        return raw.cast(pa.int64())
+    except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+        pass
+
+    try:
+        return raw.cast(pa.float64())
+    except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+        numbers = pd.to_numeric(raw.to_pandas(), errors="coerce").astype("float64")
+        return pa.chunked_array([pa.array(numbers, from_pandas=True)])
+
+
+def _arrow_strptime_matches(raw, datetime_parser, pc):
+    """
+    Infer the format from the first batch and check Arrow's strptime parses
+    a sample at least as well as pandas does.
+    """
+    sample = raw.slice(0, DatetimeParser.SAMPLE_SIZE)
+    sample_series = sample.to_pandas()
+
+    # Parsing the sample also makes the parser infer and keep its format
+    pandas_parsed = datetime_parser.parse(sample_series)
+
+    if not datetime_parser.datetime_format:
+        return False
+
+    try:
+        arrow_parsed = pc.strptime(
+            sample,
+            format=datetime_parser.datetime_format,
+            unit="ns",
+            error_is_null=True
+        )
+    except Exception:
+        return False
+
+    return arrow_parsed.null_count <= int(pandas_parsed.isna().sum())
+
+
+def iter_filtered_chunks(engine, handle, datetime_column, start_dt, end_dt,
+                         usecols=None, column_names=None, chunk_planner=None,
+                         datetime_parser=None, order_check=None):
+    reader = iter_arrow_filtered_chunks if engine == "pyarrow" else iter_pandas_filtered_chunks
+
+    return reader(
+        handle, datetime_column, start_dt, end_dt, usecols, column_names,
+        chunk_planner, datetime_parser, order_check
+    )
@@ -0,0 +1,511 @@
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+
+import pandas as pd
+
+from csv_chunk_common import (
+    COMPRESSION_EXTENSIONS, CSV_ENGINES, DEFAULT_MEMORY_BUDGET_MB, DEFAULT_RESAMPLE_LATENESS,
+    OUTPUT_FORMATS, PARTITION_PERIODS, RESAMPLE_AGGREGATIONS, ChunkPlanner, CSVChunkWriter, DatetimeParser,
+    PartitionedChunkWriter, ProgressFile, ResamplingChunkWriter, StreamingResampler,
+    TimeOrderCheck, input_compression, iter_filtered_chunks, open_chunk_writer,
+    output_extension, projected_columns, strip_data_extensions, worker_memory_budget
+)
+from csv_time_index import (
+    read_csv_header, load_or_build_time_index, byte_range_for, complete_lines_end,
+    load_or_build_zone_map, zone_map_ranges
+)
+
+
+FOLLOW_STATE_SUFFIX = ".follow.json"
+FOLLOW_STATE_VERSION = 1
+
+
+def filtered_output_path(csv_path, output_format="CSV", compression=None, output_dir=None,
+                         suffix=""):
+    """Name the output the way the GUI tools do: <input>_filtered_<timestamp><ext>."""
+    output_dir = output_dir or os.path.dirname(csv_path)
+    input_name = strip_data_extensions(os.path.basename(csv_path))
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    extension = output_extension(output_format, compression)
+    return os.path.join(output_dir, f"{input_name}_filtered_{timestamp}{suffix}{extension}")
+
+
+def partitions_output_dir(csv_path, output_dir=None, suffix=""):
+    """Folder for partitioned output: <input>_partitions_<timestamp>."""
+    output_dir = output_dir or os.path.dirname(csv_path)
+    input_name = strip_data_extensions(os.path.basename(csv_path))
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    return os.path.join(output_dir, f"{input_name}_partitions_{timestamp}{suffix}")
+
+
+def filter_csv_by_datetime(csv_path, output_path, datetime_column, start_dt, end_dt,
+                           output_columns=None, use_index=False, stop_early=False,
+                           output_format="CSV", compression=None, engine="pandas",
+                           memory_budget_mb=DEFAULT_MEMORY_BUDGET_MB,
+                           on_progress=None, on_status=None, should_stop=None,
+                           partition_by=None, max_open_partitions=64, use_zone_map=False,
+                           resample=None, aggregation="mean",
+                           resample_lateness=DEFAULT_RESAMPLE_LATENESS):
+    """
+    Write the rows of csv_path whose datetime_column falls in [start_dt, end_dt]
+    to output_path. A header-only file is written when nothing matches.
+
+    With partition_by set to "Hour", "Day" or "Week", output_path is a folder
+    and every row goes straight to the file of its partition; the summary
+    then also holds partition_rows (partition label -> rows).
+
+    With resample set to a pandas frequency such as "1min", numeric columns
+    are aggregated per time bucket while streaming and only the buckets are
+    written. A bucket is written once the newest timestamp read is
+    resample_lateness past its end; rows later than that are left out and
+    counted in the summary's late_rows.
+
+    use_index seeks straight to the range in files whose rows are all in
+    time order (checked once on every row when the index is built, so it
+    pays off on repeated queries); use_zone_map
+    reads only the blocks whose min/max timestamps overlap the range, which
+    also helps on files that are only roughly in time order.
+
+    on_progress(percent, stats) is called after every chunk, on_status(message)
+    for status changes, and should_stop() is polled between chunks to cancel.
+    Returns a summary dict with total_rows, filtered_rows, elapsed and cancelled.
+    """
+    on_progress = on_progress or (lambda percent, stats: None)
+    on_status = on_status or (lambda message: None)
+    should_stop = should_stop or (lambda: False)
+
+    columns, data_offset = read_csv_header(csv_path)
+
+    if datetime_column not in columns:
+        raise ValueError(f"Column '{datetime_column}' not found in CSV.")
+
+    missing = [column for column in output_columns or [] if column not in columns]
+    if missing:
+        raise ValueError(f"Output columns not found in CSV: {', '.join(missing)}")
+
+    usecols = projected_columns(columns, output_columns or [], datetime_column)
+
+    if input_compression(csv_path) is not None:
+        if use_index or use_zone_map:
+            on_status("Compressed CSV cannot be seeked, scanning the whole file")
+
+        # Header is part of the decompressed stream
+        source = ProgressFile(csv_path)
+        column_names = None
+    else:
+        file_size = os.path.getsize(csv_path)
+        ranges = [(data_offset, file_size)]
+
+        # The zone map is correct on any row order, so it wins when requested
+        if use_index and use_zone_map:
+            on_status("Zone map requested, not using the time index")
+
+        if use_index and not use_zone_map:
+            on_status("Loading time index...")
+
+            index = load_or_build_time_index(csv_path, datetime_column)
+
+            if index["sorted"]:
+                ranges = [byte_range_for(index, start_dt, end_dt)]
+            else:
+                on_status("CSV is not sorted by datetime, scanning the whole file")
+
+        if use_zone_map:
+            on_status("Loading zone map...")
+
+            zone_map = load_or_build_zone_map(csv_path, datetime_column)
+            ranges = zone_map_ranges(zone_map, start_dt, end_dt)
+            read_bytes = sum(stop - start for start, stop in ranges)
+
+            on_status(
+                f"Zone map: reading {read_bytes / (1024 * 1024):.1f} of "
+                f"{(file_size - data_offset) / (1024 * 1024):.1f} MB"
+            )
+
+        source = ProgressFile(csv_path, ranges=ranges)
+        column_names = columns
+
+    partitioned = partition_by not in (None, "None")
+    started = time.monotonic()
+
+    if partitioned:
+        writer = PartitionedChunkWriter(
+            output_path, strip_data_extensions(os.path.basename(csv_path)),
+            datetime_column, partition_by, output_format, compression,
+            max_open_partitions
+        )
+    else:
+        writer = open_chunk_writer(output_path, output_format, compression)
+
+    if resample not in (None, "None"):
+        writer = ResamplingChunkWriter(
+            writer,
+            StreamingResampler(
+                datetime_column, resample, aggregation, allowed_lateness=resample_lateness
+            )
+        )
+
+    try:
+        with source:
+            total_rows, filtered_rows, cancelled = _filter_source_into(
+                writer, source, engine, datetime_column, start_dt, end_dt, usecols,
+                column_names, memory_budget_mb, stop_early, on_progress, on_status,
+                should_stop
+            )
+
+        if writer.chunks_written == 0 and not partitioned:
+            # Nothing was read in range, still produce a header-only file
+            writer.write(pd.DataFrame(columns=usecols or columns))
+    finally:
+        writer.close()
+
+    summary = {
+        "total_rows": total_rows,
+        "filtered_rows": filtered_rows,
+        "rows_written": writer.rows_written,
+        "elapsed": time.monotonic() - started,
+        "cancelled": cancelled,
+    }
+
+    if partitioned:
+        partition_writer = writer.writer if isinstance(writer, ResamplingChunkWriter) else writer
+        summary["partition_rows"] = dict(partition_writer.partition_rows)
+
+    if isinstance(writer, ResamplingChunkWriter):
+        summary["late_rows"] = writer.resampler.late_rows
+
+        if writer.resampler.late_rows:
+            on_status(
+                f"Warning: {writer.resampler.late_rows} rows came more than "
+                f"{resample_lateness} after newer rows, their buckets were already "
+                "written so they were left out."
+            )
+
+    return summary
+
+
+def _filter_source_into(writer, source, engine, datetime_column, start_dt, end_dt,
+                        usecols, column_names, memory_budget_mb, stop_early,
+                        on_progress, on_status, should_stop):
+    total_rows = 0
+    filtered_rows = 0
+    cancelled = False
+    datetime_parser = DatetimeParser()
+    order_check = TimeOrderCheck() if stop_early else None
+    total_bytes = source.total_bytes
+    started = time.monotonic()
+
+    chunks = iter_filtered_chunks(
+        engine,
+        source.handle,
+        datetime_column,
+        start_dt,
+        end_dt,
+        usecols=usecols,
+        column_names=column_names,
+        chunk_planner=ChunkPlanner(memory_budget_mb),
+        datetime_parser=datetime_parser,
+        order_check=order_check
+    )
+
+    for rows_read, chunk_min, filtered_chunk in chunks:
+        if should_stop():
+            cancelled = True
+            break
+
+        if total_rows == 0:
+            on_status(f"Datetime parsing: {datetime_parser.describe()}")
+
+        total_rows += rows_read
+
+        if stop_early and not order_check.in_order:
+            stop_early = False
+            on_status(
+                f"Warning: '{datetime_column}' is out of order around row {total_rows}, "
+                "early exit disabled; reading the whole file."
+            )
+
+        # Sorted file: once a whole chunk is past the end, so is the rest
+        if stop_early and chunk_min > end_dt:
+            on_status("Reached rows after end datetime, stopping early.")
+            break
+
+        filtered_rows += len(filtered_chunk)
+
+        writer.write(filtered_chunk)
+
+        bytes_done = source.bytes_read()
+        elapsed = max(time.monotonic() - started, 1e-6)
+        bytes_per_sec = bytes_done / elapsed
+
+        on_progress(source.percent(), {
+            "total_rows": total_rows,
+            "filtered_rows": filtered_rows,
+            "rows_per_sec": total_rows / elapsed,
+            "mb_per_sec": bytes_per_sec / (1024 * 1024),
+            "eta_seconds": (
+                (total_bytes - bytes_done) / bytes_per_sec
+                if bytes_per_sec > 0 else None
+            ),
+        })
+
+    return total_rows, filtered_rows, cancelled
+
+
+def follow_state_path(output_path):
+    return output_path + FOLLOW_STATE_SUFFIX
+
+
+def follow_output_path(csv_path, compression=None, output_dir=None, suffix=""):
+    """Stable name for follow mode, so every refresh appends to the same file."""
+    output_dir = output_dir or os.path.dirname(csv_path)
+    input_name = strip_data_extensions(os.path.basename(csv_path))
+    extension = output_extension("CSV", compression)
+    return os.path.join(output_dir, f"{input_name}_filtered_follow{suffix}{extension}")
+
+
+def _load_follow_state(output_path):
+    try:
+        with open(follow_state_path(output_path), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _save_follow_state(output_path, state):
+    with open(follow_state_path(output_path), "w", encoding="utf-8") as f:
+        json.dump(state, f)
+
+
+def follow_csv_by_datetime(csv_path, output_path, datetime_column, start_dt, end_dt,
+                           output_columns=None, compression=None, engine="pandas",
+                           memory_budget_mb=DEFAULT_MEMORY_BUDGET_MB,
+                           on_progress=None, on_status=None):
+    """
+    Incremental version of filter_csv_by_datetime for a CSV that keeps growing.
+
+    The byte offset reached and the header are kept in a sidecar next to the
+    output, so each call only reads complete lines appended since the last
+    one and appends the matches to output_path (CSV only). The output is
+    rebuilt from scratch when the query changes or the input was truncated,
+    replaced or got a different header.
+    """
+    on_progress = on_progress or (lambda percent, stats: None)
+    on_status = on_status or (lambda message: None)
+
+    if input_compression(csv_path) is not None:
+        raise ValueError("Follow mode needs an uncompressed CSV input.")
+
+    columns, data_offset = read_csv_header(csv_path)
+
+    if datetime_column not in columns:
+        raise ValueError(f"Column '{datetime_column}' not found in CSV.")
+
+    missing = [column for column in output_columns or [] if column not in columns]
+    if missing:
+        raise ValueError(f"Output columns not found in CSV: {', '.join(missing)}")
+
+    usecols = projected_columns(columns, output_columns or [], datetime_column)
+    stat = os.stat(csv_path)
+    query = {
+        "csv_path": os.path.abspath(csv_path),
+        "column": datetime_column,
+        "start": pd.Timestamp(start_dt).isoformat(),
+        "end": pd.Timestamp(end_dt).isoformat(),
+        "output_columns": usecols,
+        "compression": compression,
+    }
+
+    state = _load_follow_state(output_path)
+    resume = (
+        state is not None
+        and state.get("version") == FOLLOW_STATE_VERSION
+        and state.get("query") == query
+        and state.get("columns") == columns
+        and state.get("inode") == stat.st_ino
+        and state.get("offset", stat.st_size + 1) <= stat.st_size
+        and os.path.exists(output_path)
+    )
+
+    if resume:
+        start_offset = state["offset"]
+    else:
+        if state is not None:
+            on_status("Input or query changed since the last refresh, rebuilding the output")
+        start_offset = data_offset
+
+    stop_offset = complete_lines_end(csv_path, start_offset, stat.st_size)
+    started = time.monotonic()
+    total_rows = 0
+    filtered_rows = 0
+
+    writer = CSVChunkWriter(output_path, compression, append=resume)
+
+    try:
+        if stop_offset > start_offset:
+            with ProgressFile(csv_path, start_offset, stop_offset) as source:
+                total_rows, filtered_rows, _ = _filter_source_into(
+                    writer, source, engine, datetime_column, start_dt, end_dt, usecols,
+                    columns, memory_budget_mb, False, on_progress, on_status,
+                    lambda: False
+                )
+
+        if not resume and writer.chunks_written == 0:
+            writer.write(pd.DataFrame(columns=usecols or columns))
+    finally:
+        writer.close()
+
+    _save_follow_state(output_path, {
+        "version": FOLLOW_STATE_VERSION,
+        "query": query,
+        "columns": columns,
+        "inode": stat.st_ino,
+        "offset": stop_offset,
+    })
+
+    return {
+        "total_rows": total_rows,
+        "filtered_rows": filtered_rows,
+        "elapsed": time.monotonic() - started,
+        "restarted": not resume,
+    }
+
+
+def parse_cli_datetime(value):
+    try:
+        return pd.Timestamp(value).to_pydatetime()
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Invalid datetime: '{value}'")
+
+
+def build_arg_parser():
+    parser = argparse.ArgumentParser(
+        description="Filter CSV files by a datetime range without the GUI."
+    )
+    parser.add_argument("inputs", nargs="+", help="CSV files to filter (.csv, .csv.gz, .csv.bz2, .csv.xz).")
+    parser.add_argument("-c", "--column", required=True, help="Datetime column name.")
+    parser.add_argument("-s", "--start", required=True, type=parse_cli_datetime, help="Start datetime, e.g. '2024-01-01 10:00:00'.")
+    parser.add_argument("-e", "--end", required=True, type=parse_cli_datetime, help="End datetime (inclusive).")
+    parser.add_argument("-o", "--output-dir", help="Output folder; defaults to each input file's folder.")
+    parser.add_argument("--columns", help="Comma-separated output columns; defaults to all columns.")
+    parser.add_argument("--format", default="CSV", choices=list(OUTPUT_FORMATS), help="Output format.")
+    parser.add_argument("--compression", choices=list(COMPRESSION_EXTENSIONS.values()), help="Compress CSV output.")
+    parser.add_argument("--engine", default="pandas", choices=CSV_ENGINES, help="CSV parsing engine.")
+    parser.add_argument("--index", dest="use_index", action="store_true", help="Build or use the sidecar time index to seek in fully time-sorted files.")
+    parser.add_argument("--zone-map", action="store_true", help="Build or use the min/max zone-map sidecar to skip blocks outside the range.")
+    parser.add_argument("--stop-early", action="store_true", help="Stop reading after the end datetime (input sorted by datetime).")
+    parser.add_argument("--partition", choices=PARTITION_PERIODS[1:], help="Write one file per hour, day or week into a folder per input.")
+    parser.add_argument("--resample", help="Aggregate per time bucket, e.g. 1min or 1h (pandas frequency).")
+    parser.add_argument("--aggregation", default="mean", choices=RESAMPLE_AGGREGATIONS, help="Aggregation used with --resample.")
+    parser.add_argument("--resample-lateness", default=DEFAULT_RESAMPLE_LATENESS, help="How far a row may trail newer rows and still be resampled into its bucket (default: %(default)s).")
+    parser.add_argument("--max-open-files", type=int, default=64, help="Partition files kept open at once per input.")
+    parser.add_argument("--follow", action="store_true", help="Only read lines appended since the last --follow run and append matches (CSV output).")
+    parser.add_argument("-j", "--workers", type=int, default=os.cpu_count() or 1, help="Files filtered at the same time.")
+    parser.add_argument("--memory-budget", type=int, default=DEFAULT_MEMORY_BUDGET_MB, help="Total chunk memory budget in MB, shared by the workers.")
+    return parser
+
+
+def main(argv=None):
+    args = build_arg_parser().parse_args(argv)
+
+    if args.start > args.end:
+        print("Error: start datetime cannot be greater than end datetime.", file=sys.stderr)
+        return 2
+
+    if args.follow and args.format != "CSV":
+        print("Error: --follow appends to the output and needs --format CSV.", file=sys.stderr)
+        return 2
+
+    if args.follow and (args.partition or args.resample):
+        print("Error: --follow cannot be combined with --partition or --resample.", file=sys.stderr)
+        return 2
+
+    try:
+        pd.Timedelta(args.resample_lateness)
+    except ValueError:
+        print(f"Error: invalid --resample-lateness '{args.resample_lateness}'.", file=sys.stderr)
+        return 2
+
+    compression = args.compression if args.format == "CSV" else None
+    output_columns = [c.strip() for c in args.columns.split(",")] if args.columns else None
+    workers = max(1, min(args.workers, len(args.inputs)))
+    worker_budget_mb = worker_memory_budget(args.memory_budget, workers)
+
+    if args.output_dir:
+        os.makedirs(args.output_dir, exist_ok=True)
+
+    failures = 0
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {}
+        output_paths = set()
+
+        for csv_path in args.inputs:
+            # Same-named inputs (data.csv, data.csv.gz, other/data.csv) must not collide
+            duplicate = 1
+            suffix = ""
+            while True:
+                if args.follow:
+                    output_path = follow_output_path(csv_path, compression, args.output_dir, suffix)
+                elif args.partition:
+                    output_path = partitions_output_dir(csv_path, args.output_dir, suffix)
+                else:
+                    output_path = filtered_output_path(
+                        csv_path, args.format, compression, args.output_dir, suffix
+                    )
+
+                if output_path not in output_paths:
+                    break
+
+                duplicate += 1
+                suffix = f"_{duplicate}"
+
+            output_paths.add(output_path)
+
+            if args.follow:
+                future = executor.submit(
+                    follow_csv_by_datetime,
+                    csv_path, output_path, args.column, args.start, args.end,
+                    output_columns, compression, args.engine, worker_budget_mb
+                )
+            else:
+                future = executor.submit(
+                    filter_csv_by_datetime,
+                    csv_path, output_path, args.column, args.start, args.end,
+                    output_columns, args.use_index, args.stop_early,
+                    args.format, compression, args.engine, worker_budget_mb,
+                    partition_by=args.partition, max_open_partitions=args.max_open_files,
+                    use_zone_map=args.zone_map, resample=args.resample,
+                    aggregation=args.aggregation, resample_lateness=args.resample_lateness
+                )
+            futures[future] = (csv_path, output_path)
+
+        for future in as_completed(futures):
+            csv_path, output_path = futures[future]
+
+            try:
+                summary = future.result()
+            except Exception as e:
+                failures += 1
+                print(f"FAILED {csv_path}: {e}", file=sys.stderr)
+                continue
+
+            print(
+                f"{csv_path} -> {output_path}: "
+                f"{summary['filtered_rows']} of {summary['total_rows']} rows "
+                f"in {summary['elapsed']:.1f}s"
+            )
+
+            if "partition_rows" in summary:
+                print(f"  {len(summary['partition_rows'])} partition(s)")
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
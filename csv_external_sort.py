@@ -0,0 +1,290 @@
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from csv_chunk_common import (
+    COMPRESSION_EXTENSIONS, DEFAULT_MEMORY_BUDGET_MB, ChunkPlanner, CSVChunkWriter,
+    DatetimeParser, ProgressFile, output_extension, strip_data_extensions, to_datetime64_ns
+)
+from csv_time_index import read_csv_header
+
+
+SORT_KEY_COLUMN = "__sort_key_ns__"
+DEFAULT_MERGE_FAN_IN = 64
+
+# Rows without a parseable timestamp go to the end
+_MISSING_KEY = np.iinfo(np.int64).max
+
+
+def sorted_output_path(csv_path, compression=None, output_dir=None):
+    """<input>_sorted_<timestamp>.csv next to the input, like the filter outputs."""
+    output_dir = output_dir or os.path.dirname(csv_path)
+    input_name = strip_data_extensions(os.path.basename(csv_path))
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    return os.path.join(output_dir, f"{input_name}_sorted_{timestamp}{output_extension('CSV', compression)}")
+
+
+def _read_text_chunks(handle, chunk_planner):
+    # Values stay text so the sorted file holds exactly what the input held
+    return chunk_planner.read_csv(handle, dtype=str, keep_default_na=False)
+
+
+def _sort_keys(values, datetime_parser):
+    parsed = datetime_parser.parse(values)
+    keys = to_datetime64_ns(parsed).copy()
+    keys[parsed.isna().to_numpy()] = _MISSING_KEY
+    return keys
+
+
+def _spill_runs(source, datetime_column, chunk_planner, temp_dir, on_progress, should_stop):
+    """Phase 1: sort memory-sized chunks and write each one as a run file."""
+    datetime_parser = DatetimeParser()
+    run_paths = []
+    total_rows = 0
+
+    for chunk in _read_text_chunks(source.handle, chunk_planner):
+        if should_stop():
+            return None, total_rows
+
+        if datetime_column not in chunk.columns:
+            raise ValueError(f"Column '{datetime_column}' not found in CSV.")
+
+        if chunk.empty:
+            # A header-only file still yields one empty chunk; it is not a run
+            continue
+
+        chunk.insert(0, SORT_KEY_COLUMN, _sort_keys(chunk[datetime_column], datetime_parser))
+        chunk = chunk.sort_values(SORT_KEY_COLUMN, kind="stable")
+
+        run_path = os.path.join(temp_dir, f"run_{len(run_paths):06d}.csv")
+        writer = CSVChunkWriter(run_path)
+        writer.write(chunk)
+        writer.close()
+
+        run_paths.append(run_path)
+        total_rows += len(chunk)
+        on_progress(source.percent() // 2, total_rows)
+
+    return run_paths, total_rows
+
+
+class _RunCursor:
+    """Buffered reader over one sorted run."""
+
+    def __init__(self, run_path, buffer_rows):
+        self._reader = pd.read_csv(
+            run_path, dtype=str, keep_default_na=False, chunksize=buffer_rows
+        )
+        self.buffer = None
+        self.refill()
+
+    def refill(self):
+        try:
+            buffer = next(self._reader)
+        except StopIteration:
+            self._reader.close()
+            self.buffer = None
+            return
+
+        buffer[SORT_KEY_COLUMN] = buffer[SORT_KEY_COLUMN].astype("int64")
+        self.buffer = buffer
+
+    def take_through(self, bound):
+        """Remove and return the buffered rows with key <= bound."""
+        keys = self.buffer[SORT_KEY_COLUMN].to_numpy()
+        cut = int(np.searchsorted(keys, bound, side="right"))
+
+        taken = self.buffer.iloc[:cut]
+        self.buffer = self.buffer.iloc[cut:]
+
+        if self.buffer.empty:
+            self.refill()
+
+        return taken
+
+
+def _merge_runs(run_paths, writer, buffer_rows, keep_key, should_stop, on_rows=None):
+    """
+    k-way merge of sorted runs. Every round emits all buffered rows up to the
+    smallest "last buffered key" across runs: no unread row can sort before
+    that bound, so each round is one vectorised sort instead of a per-row heap.
+    """
+    cursors = [_RunCursor(path, buffer_rows) for path in run_paths]
+    cursors = [cursor for cursor in cursors if cursor.buffer is not None]
+
+    while cursors:
+        if should_stop():
+            return False
+
+        bound = min(int(cursor.buffer[SORT_KEY_COLUMN].iloc[-1]) for cursor in cursors)
+        parts = [cursor.take_through(bound) for cursor in cursors]
+        merged = pd.concat(parts, ignore_index=True).sort_values(SORT_KEY_COLUMN, kind="stable")
+
+        writer.write(merged if keep_key else merged.drop(columns=SORT_KEY_COLUMN))
+
+        if on_rows is not None:
+            on_rows(len(merged))
+
+        cursors = [cursor for cursor in cursors if cursor.buffer is not None]
+
+    return True
+
+
+def sort_csv_by_datetime(csv_path, output_path, datetime_column,
+                         memory_budget_mb=DEFAULT_MEMORY_BUDGET_MB, compression=None,
+                         merge_fan_in=DEFAULT_MERGE_FAN_IN, temp_dir=None,
+                         on_progress=None, on_status=None, should_stop=None):
+    """
+    Sort a CSV that may not fit in memory by its datetime column.
+
+    Chunks sized by the memory budget are sorted and spilled to temporary run
+    files, which are then k-way merged into output_path. With more runs than
+    merge_fan_in, groups of runs are merged into longer runs first so only a
+    bounded number of files is read at once. Rows with equal timestamps keep
+    their input order within a run; rows with unparseable timestamps go last.
+
+    on_progress(percent, rows) and on_status(message) report progress and
+    should_stop() is polled to cancel. Returns a summary dict with
+    total_rows, runs, merge_passes, elapsed and cancelled.
+    """
+    on_progress = on_progress or (lambda percent, rows: None)
+    on_status = on_status or (lambda message: None)
+    should_stop = should_stop or (lambda: False)
+    merge_fan_in = max(2, merge_fan_in)
+
+    started = time.monotonic()
+    chunk_planner = ChunkPlanner(memory_budget_mb)
+    work_dir = tempfile.mkdtemp(
+        prefix="csv_sort_", dir=temp_dir or os.path.dirname(output_path) or None
+    )
+
+    summary = {"total_rows": 0, "runs": 0, "merge_passes": 0, "cancelled": False}
+
+    try:
+        on_status("Sorting chunks into runs...")
+
+        with ProgressFile(csv_path) as source:
+            run_paths, total_rows = _spill_runs(
+                source, datetime_column, chunk_planner, work_dir, on_progress, should_stop
+            )
+
+        summary["total_rows"] = total_rows
+
+        if run_paths is None:
+            summary["cancelled"] = True
+            return summary
+
+        summary["runs"] = len(run_paths)
+
+        if not run_paths:
+            # Header-only input
+            columns, _ = read_csv_header(csv_path)
+            writer = CSVChunkWriter(output_path, compression)
+            writer.write(pd.DataFrame(columns=columns))
+            writer.close()
+            return summary
+
+        def buffer_rows_for(run_count):
+            # Every open run holds one buffer, plus one merged batch in flight
+            share = chunk_planner.memory_budget / (run_count + 1)
+            return max(int(share / max(chunk_planner.bytes_per_row or 1, 1)), 1000)
+
+        # Intermediate passes until one merge can read every run at once
+        while len(run_paths) > merge_fan_in:
+            summary["merge_passes"] += 1
+            on_status(f"Merging {len(run_paths)} runs, pass {summary['merge_passes']}...")
+            merged_paths = []
+
+            for i in range(0, len(run_paths), merge_fan_in):
+                group = run_paths[i:i + merge_fan_in]
+                merged_path = os.path.join(
+                    work_dir, f"pass{summary['merge_passes']}_{len(merged_paths):06d}.csv"
+                )
+                writer = CSVChunkWriter(merged_path)
+
+                try:
+                    finished = _merge_runs(
+                        group, writer, buffer_rows_for(len(group)), True, should_stop
+                    )
+                finally:
+                    writer.close()
+
+                if not finished:
+                    summary["cancelled"] = True
+                    return summary
+
+                for path in group:
+                    os.remove(path)
+                merged_paths.append(merged_path)
+
+            run_paths = merged_paths
+
+        summary["merge_passes"] += 1
+        on_status(f"Merging {len(run_paths)} runs into the output...")
+
+        rows_written = 0
+
+        def report_rows(rows):
+            nonlocal rows_written
+            rows_written += rows
+            on_progress(50 + int(rows_written / max(total_rows, 1) * 50), rows_written)
+
+        writer = CSVChunkWriter(output_path, compression)
+
+        try:
+            finished = _merge_runs(
+                run_paths, writer, buffer_rows_for(len(run_paths)), False, should_stop,
+                report_rows
+            )
+        finally:
+            writer.close()
+
+        summary["cancelled"] = not finished
+        return summary
+
+    finally:
+        summary["elapsed"] = time.monotonic() - started
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Sort a CSV larger than memory by its datetime column."
+    )
+    parser.add_argument("input", help="CSV file to sort (.csv, .csv.gz, .csv.bz2, .csv.xz).")
+    parser.add_argument("-c", "--column", required=True, help="Datetime column name.")
+    parser.add_argument("-o", "--output", help="Output CSV; defaults to <input>_sorted_<timestamp>.csv.")
+    parser.add_argument("--compression", choices=list(COMPRESSION_EXTENSIONS.values()), help="Compress the output.")
+    parser.add_argument("--memory-budget", type=int, default=DEFAULT_MEMORY_BUDGET_MB, help="Memory cap for sorting in MB.")
+    parser.add_argument("--fan-in", type=int, default=DEFAULT_MERGE_FAN_IN, help="Most runs merged at once.")
+    parser.add_argument("--temp-dir", help="Folder for temporary runs; defaults to the output folder.")
+    args = parser.parse_args(argv)
+
+    output_path = args.output or sorted_output_path(args.input, args.compression)
+
+    try:
+        summary = sort_csv_by_datetime(
+            args.input, output_path, args.column, args.memory_budget, args.compression,
+            args.fan_in, args.temp_dir, on_status=print
+        )
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    print(
+        f"{args.input} -> {output_path}: {summary['total_rows']} rows, "
+        f"{summary['runs']} runs, {summary['merge_passes']} merge passes "
+        f"in {summary['elapsed']:.1f}s"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,395 @@
+import csv
+import io
+import json
+import os
+from bisect import bisect_left, bisect_right
+from itertools import islice
+
+import pandas as pd
+
+from csv_chunk_common import DatetimeParser, open_input
+
+
+INDEX_SUFFIX = ".tsidx.json"
+# Version 2: "sorted" is checked on every row, not just the sampled lines
+INDEX_VERSION = 2
+DEFAULT_BLOCK_BYTES = 1024 * 1024
+
+ZONE_MAP_SUFFIX = ".zonemap.json"
+ZONE_MAP_VERSION = 1
+DEFAULT_ZONE_ROWS = 100000
+
+
+def index_path_for(csv_path):
+    return csv_path + INDEX_SUFFIX
+
+
+def read_csv_header(csv_path):
+    """
+    Return (columns, data_offset) where data_offset is the byte position
+    of the first data row. For compressed files the offset is in
+    decompressed bytes and cannot be used for seeking.
+    """
+    with open_input(csv_path) as f:
+        header_line = f.readline()
+        data_offset = f.tell()
+
+    text = header_line.decode("utf-8-sig", errors="replace")
+    columns = next(csv.reader([text]), [])
+    return columns, data_offset
+
+
+def _file_signature(csv_path):
+    stat = os.stat(csv_path)
+    return stat.st_size, stat.st_mtime
+
+
+def _rows_are_sorted(csv_path, datetime_column, chunk_rows=500000):
+    """
+    True when every parseable timestamp in the column is >= the one before
+    it. Rows without a timestamp cannot match a range and are ignored.
+    """
+    datetime_parser = DatetimeParser()
+    previous_ns = None
+
+    reader = pd.read_csv(
+        csv_path, usecols=[datetime_column], dtype=str, keep_default_na=False,
+        chunksize=chunk_rows
+    )
+
+    with reader:
+        for chunk in reader:
+            timestamps = datetime_parser.parse(chunk[datetime_column]).dropna()
+            if timestamps.empty:
+                continue
+
+            if not timestamps.is_monotonic_increasing:
+                return False
+            if previous_ns is not None and timestamps.iloc[0].value < previous_ns:
+                return False
+
+            previous_ns = timestamps.iloc[-1].value
+
+    return True
+
+
+def build_time_index(csv_path, datetime_column, block_bytes=DEFAULT_BLOCK_BYTES):
+    """
+    Build a sparse index of (first timestamp, byte offset) per block.
+
+    Only one line per block is sampled for the index itself. Seeking skips
+    whole blocks, so it is only safe when every row is in time order: a
+    single late row outside the selected blocks would be lost. "sorted" is
+    therefore checked on the full datetime column once, when the index is
+    built, and the sidecar caches the result for later queries.
+    """
+    columns, data_offset = read_csv_header(csv_path)
+
+    if datetime_column not in columns:
+        raise ValueError(f"Column '{datetime_column}' not found in CSV.")
+
+    column_index = columns.index(datetime_column)
+    file_size, mtime = _file_signature(csv_path)
+
+    offsets = []
+    raw_values = []
+
+    with open(csv_path, "rb") as f:
+        position = data_offset
+        while position < file_size:
+            # Step back one byte so a block boundary that falls exactly on
+            # a line start does not skip that line.
+            f.seek(position - 1)
+            f.readline()
+            line_start = f.tell()
+            line = f.readline()
+
+            if not line:
+                break
+
+            if not offsets or line_start > offsets[-1]:
+                fields = next(csv.reader([line.decode("utf-8", errors="replace")]), [])
+                if column_index < len(fields):
+                    offsets.append(line_start)
+                    raw_values.append(fields[column_index])
+
+            position = max(position + block_bytes, f.tell())
+
+    # Same parsing as the filters, so epoch-number columns are indexed too
+    timestamps = DatetimeParser().parse(pd.Series(raw_values, dtype=object))
+    valid = timestamps.notna().to_numpy()
+
+    timestamps_ns = [int(ts.value) for ts in timestamps[valid]]
+    offsets = [offset for offset, keep in zip(offsets, valid) if keep]
+
+    # The sampled lines rule most unsorted files out without a full scan
+    is_sorted = (
+        all(a <= b for a, b in zip(timestamps_ns, timestamps_ns[1:]))
+        and _rows_are_sorted(csv_path, datetime_column)
+    )
+
+    return {
+        "version": INDEX_VERSION,
+        "size": file_size,
+        "mtime": mtime,
+        "column": datetime_column,
+        "block_bytes": block_bytes,
+        "columns": columns,
+        "data_offset": data_offset,
+        "sorted": is_sorted,
+        "timestamps_ns": timestamps_ns,
+        "offsets": offsets,
+    }
+
+
+def load_time_index(csv_path, datetime_column):
+    """
+    Load the sidecar index if it exists and still matches the CSV file.
+    Returns None when the index is missing or stale.
+    """
+    index_path = index_path_for(csv_path)
+    if not os.path.exists(index_path):
+        return None
+
+    try:
+        with open(index_path, "r", encoding="utf-8") as f:
+            index = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    file_size, mtime = _file_signature(csv_path)
+
+    if (
+        index.get("version") != INDEX_VERSION
+        or index.get("column") != datetime_column
+        or index.get("size") != file_size
+        or index.get("mtime") != mtime
+    ):
+        return None
+
+    return index
+
+
+def save_time_index(csv_path, index):
+    with open(index_path_for(csv_path), "w", encoding="utf-8") as f:
+        json.dump(index, f)
+
+
+def load_or_build_time_index(csv_path, datetime_column, block_bytes=DEFAULT_BLOCK_BYTES):
+    index = load_time_index(csv_path, datetime_column)
+    if index is not None:
+        return index
+
+    index = build_time_index(csv_path, datetime_column, block_bytes)
+
+    try:
+        save_time_index(csv_path, index)
+    except OSError:
+        # Read-only location, the index is still usable for this run
+        pass
+
+    return index
+
+
+def byte_range_for(index, start_dt, end_dt):
+    """
+    Return (start_offset, stop_offset) covering every row between
+    start_dt and end_dt in a time-sorted file.
+    """
+    timestamps_ns = index["timestamps_ns"]
+    offsets = index["offsets"]
+
+    start_ns = pd.Timestamp(start_dt).value
+    end_ns = pd.Timestamp(end_dt).value
+
+    # Last block starting strictly before start_dt; rows equal to start_dt
+    # may still sit at the end of that block.
+    i = bisect_left(timestamps_ns, start_ns) - 1
+    start_offset = offsets[i] if i >= 0 else index["data_offset"]
+
+    # First block starting after end_dt; nothing from there on can match.
+    j = bisect_right(timestamps_ns, end_ns)
+    stop_offset = offsets[j] if j < len(offsets) else index["size"]
+
+    return start_offset, max(start_offset, stop_offset)
+
+
+def zone_map_path_for(csv_path):
+    return csv_path + ZONE_MAP_SUFFIX
+
+
+def build_zone_map(csv_path, datetime_column, block_rows=DEFAULT_ZONE_ROWS,
+                   numeric_columns=None):
+    """
+    Record the min/max timestamp (and min/max of numeric_columns) of every
+    block of block_rows rows, with the block's byte range.
+
+    Unlike the sparse time index this works on unsorted files: a block only
+    has to be read when its [min, max] overlaps the query. Blocks are split
+    on line ends, so quoted fields must not span lines.
+    """
+    columns, data_offset = read_csv_header(csv_path)
+    numeric_columns = list(numeric_columns or [])
+
+    for column in [datetime_column] + numeric_columns:
+        if column not in columns:
+            raise ValueError(f"Column '{column}' not found in CSV.")
+
+    file_size, mtime = _file_signature(csv_path)
+    datetime_parser = DatetimeParser()
+    blocks = []
+    numeric_zones = {column: [] for column in numeric_columns}
+
+    with open(csv_path, "rb") as f:
+        f.seek(data_offset)
+        position = data_offset
+
+        while True:
+            lines = list(islice(f, block_rows))
+            if not lines:
+                break
+
+            data = b"".join(lines)
+            block = pd.read_csv(
+                io.BytesIO(data), header=None, names=columns,
+                usecols=[datetime_column] + numeric_columns
+            )
+            timestamps = datetime_parser.parse(block[datetime_column])
+
+            blocks.append([
+                position,
+                position + len(data),
+                len(lines),
+                None if timestamps.isna().all() else int(timestamps.min().value),
+                None if timestamps.isna().all() else int(timestamps.max().value),
+            ])
+
+            for column in numeric_columns:
+                values = pd.to_numeric(block[column], errors="coerce")
+                numeric_zones[column].append(
+                    [None, None] if values.isna().all()
+                    else [float(values.min()), float(values.max())]
+                )
+
+            position += len(data)
+
+    return {
+        "version": ZONE_MAP_VERSION,
+        "size": file_size,
+        "mtime": mtime,
+        "column": datetime_column,
+        "block_rows": block_rows,
+        "columns": columns,
+        "data_offset": data_offset,
+        "blocks": blocks,
+        "numeric": numeric_zones,
+    }
+
+
+def load_zone_map(csv_path, datetime_column, numeric_columns=None,
+                  block_rows=DEFAULT_ZONE_ROWS):
+    """
+    Load the zone-map sidecar if it matches the CSV file, was built with
+    block_rows rows per block and covers the requested columns. Returns None
+    when it is missing or stale.
+    """
+    try:
+        with open(zone_map_path_for(csv_path), "r", encoding="utf-8") as f:
+            zone_map = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    file_size, mtime = _file_signature(csv_path)
+
+    if (
+        zone_map.get("version") != ZONE_MAP_VERSION
+        or zone_map.get("column") != datetime_column
+        or zone_map.get("size") != file_size
+        or zone_map.get("mtime") != mtime
+        or zone_map.get("block_rows") != block_rows
+        or not set(numeric_columns or []) <= set(zone_map.get("numeric", {}))
+    ):
+        return None
+
+    return zone_map
+
+
+def save_zone_map(csv_path, zone_map):
+    with open(zone_map_path_for(csv_path), "w", encoding="utf-8") as f:
+        json.dump(zone_map, f)
+
+
+def load_or_build_zone_map(csv_path, datetime_column, block_rows=DEFAULT_ZONE_ROWS,
+                           numeric_columns=None):
+    zone_map = load_zone_map(csv_path, datetime_column, numeric_columns, block_rows)
+    if zone_map is not None:
+        return zone_map
+
+    zone_map = build_zone_map(csv_path, datetime_column, block_rows, numeric_columns)
+
+    try:
+        save_zone_map(csv_path, zone_map)
+    except OSError:
+        # Read-only location, the zone map is still usable for this run
+        pass
+
+    return zone_map
+
+
+def zone_map_ranges(zone_map, start_dt, end_dt, column_bounds=None):
+    """
+    Byte ranges of the blocks that may hold rows between start_dt and end_dt
+    (and inside column_bounds, {column: (low, high)}), with neighbouring
+    blocks merged into one range.
+    """
+    start_ns = pd.Timestamp(start_dt).value
+    end_ns = pd.Timestamp(end_dt).value
+    column_bounds = column_bounds or {}
+    ranges = []
+
+    for i, (block_start, block_stop, _, min_ns, max_ns) in enumerate(zone_map["blocks"]):
+        # Blocks without a single parseable timestamp never match
+        if min_ns is None or max_ns < start_ns or min_ns > end_ns:
+            continue
+
+        skip = False
+        for column, (low, high) in column_bounds.items():
+            zone_min, zone_max = zone_map["numeric"][column][i]
+            if zone_min is None or zone_max < low or zone_min > high:
+                skip = True
+                break
+
+        if skip:
+            continue
+
+        if ranges and ranges[-1][1] == block_start:
+            ranges[-1] = (ranges[-1][0], block_stop)
+        else:
+            ranges.append((block_start, block_stop))
+
+    return ranges
+
+
+def complete_lines_end(file_path, start, stop=None, block_bytes=64 * 1024):
+    """
+    Return the offset just past the last newline in [start, stop), so a
+    reader never sees a line that is still being written. Returns start
+    when the range holds no complete line.
+    """
+    if stop is None:
+        stop = os.path.getsize(file_path)
+
+    with open(file_path, "rb") as f:
+        position = stop
+        while position > start:
+            block_start = max(start, position - block_bytes)
+            f.seek(block_start)
+            block = f.read(position - block_start)
+
+            newline = block.rfind(b"\n")
+            if newline >= 0:
+                return block_start + newline + 1
+
+            position = block_start
+
+    return start
@@ -5,19 +5,104 @@ import pandas as pd
 from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QWidget, QPushButton, QLabel,
     QVBoxLayout, QHBoxLayout, QFileDialog, QMessageBox,
-    QDateTimeEdit, QLineEdit
+    QDateTimeEdit, QLineEdit, QCheckBox, QListWidget, QListWidgetItem,
+    QProgressBar, QComboBox, QSpinBox
 )
-from PyQt5.QtCore import QDateTime
+from PyQt5.QtCore import QDateTime, Qt, QThread, pyqtSignal
 
+from csv_chunk_common import (
+    CSV_ENGINES, DEFAULT_MEMORY_BUDGET_MB, OUTPUT_FORMATS, RESAMPLE_AGGREGATIONS,
+    RESAMPLE_FREQUENCIES, CompressionOptionsMixin, looks_time_sorted,
+    output_extension, with_output_extension
+)
+from csv_datetime_filter import filter_csv_by_datetime
+from csv_time_index import read_csv_header
+
+
+class LargeCSVFilterWorker(QThread):
+    progress_changed = pyqtSignal(int)
+    stats_changed = pyqtSignal(dict)
+    status_message = pyqtSignal(str)
+    finished_processing = pyqtSignal(dict)
+    error_occurred = pyqtSignal(str)
+
+    def __init__(self, csv_path, output_path, datetime_column, start_dt, end_dt,
+                 output_columns=None, use_index=False, stop_early=False,
+                 output_format="CSV", compression=None, engine="pandas",
+                 memory_budget_mb=DEFAULT_MEMORY_BUDGET_MB, use_zone_map=False,
+                 resample=None, aggregation="mean"):
+        super().__init__()
+        self.csv_path = csv_path
+        self.output_path = output_path
+        self.datetime_column = datetime_column
+        self.start_dt = start_dt
+        self.end_dt = end_dt
+        self.output_columns = output_columns
+        self.use_index = use_index
+        self.stop_early = stop_early
+        self.output_format = output_format
+        self.compression = compression
+        self.engine = engine
+        self.memory_budget_mb = memory_budget_mb
+        self.use_zone_map = use_zone_map
+        self.resample = resample
+        self.aggregation = aggregation
+        self.is_running = True
+
+    def stop(self):
+        self.is_running = False
+
+    def run(self):
+        try:
+            summary = filter_csv_by_datetime(
+                self.csv_path,
+                self.output_path,
+                self.datetime_column,
+                self.start_dt,
+                self.end_dt,
+                output_columns=self.output_columns,
+                use_index=self.use_index,
+                stop_early=self.stop_early,
+                output_format=self.output_format,
+                compression=self.compression,
+                engine=self.engine,
+                memory_budget_mb=self.memory_budget_mb,
+                on_progress=self.report_progress,
+                on_status=self.status_message.emit,
+                should_stop=lambda: not self.is_running,
+                use_zone_map=self.use_zone_map,
+                resample=self.resample,
+                aggregation=self.aggregation
+            )
+            self.finished_processing.emit(summary)
+
+        except Exception as e:
+            self.error_occurred.emit(str(e))
+
+    def report_progress(self, percent, stats):
+        self.progress_changed.emit(percent)
+        self.stats_changed.emit(stats)
+
+
+def format_duration(seconds):
+    if seconds is None:
+        return "--:--:--"
 
-class LargeCSVFilterApp(QMainWindow):
+    minutes, secs = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours:02d}:{minutes:02d}:{secs:02d}"
+
+
+class LargeCSVFilterApp(CompressionOptionsMixin, QMainWindow):
     def __init__(self):
         super().__init__()
 
         self.setWindowTitle("Large CSV DateTime Filter")
-        self.setGeometry(200, 200, 700, 300)
+        self.setGeometry(200, 200, 700, 500)
 
         self.csv_path = ""
+        self.sample_df = None
+        self.worker = None
 
         self.init_ui()
 
@@ -35,6 +120,7 @@ class LargeCSVFilterApp(QMainWindow):
 
         self.datetime_column_input = QLineEdit()
         self.datetime_column_input.setPlaceholderText("Example: timestamp")
+        self.datetime_column_input.editingFinished.connect(self.detect_sorted_column)
         datetime_col_layout.addWidget(self.datetime_column_input)
 
         start_layout = QHBoxLayout()
@@ -55,9 +141,80 @@ class LargeCSVFilterApp(QMainWindow):
         self.end_datetime.setDisplayFormat("yyyy-MM-dd HH:mm:ss")
         end_layout.addWidget(self.end_datetime)
 
-        filter_btn = QPushButton("Filter CSV and Save")
-        filter_btn.clicked.connect(self.filter_large_csv)
+        self.output_columns_list = QListWidget()
+        self.output_columns_list.setMaximumHeight(120)
+
+        # Building the index checks the order of every row once, so it only
+        # pays off when the same file is queried again
+        self.use_index_checkbox = QCheckBox(
+            "Use sidecar time index (CSV sorted by datetime, checked on the first run)"
+        )
+        self.use_index_checkbox.setChecked(False)
+
+        self.zone_map_checkbox = QCheckBox(
+            "Use zone map sidecar (skip blocks outside the range, unsorted CSV)"
+        )
+
+        self.stop_early_checkbox = QCheckBox(
+            "Stop after end datetime (CSV sorted by datetime)"
+        )
+
+        format_layout = QHBoxLayout()
+        format_layout.addWidget(QLabel("CSV Engine:"))
+
+        self.engine_combo = QComboBox()
+        self.engine_combo.addItems(CSV_ENGINES)
+        format_layout.addWidget(self.engine_combo)
+
+        format_layout.addWidget(QLabel("Output Format:"))
+
+        self.output_format_combo = QComboBox()
+        self.output_format_combo.addItems(list(OUTPUT_FORMATS))
+        self.output_format_combo.currentTextChanged.connect(self.update_compression_state)
+        format_layout.addWidget(self.output_format_combo)
+
+        format_layout.addWidget(QLabel("CSV Compression:"))
+
+        self.compression_combo = QComboBox()
+        self.compression_combo.addItems(["None", "gzip", "bz2", "xz"])
+        format_layout.addWidget(self.compression_combo)
+
+        format_layout.addWidget(QLabel("Memory Budget (MB):"))
+
+        self.memory_budget_spin = QSpinBox()
+        self.memory_budget_spin.setRange(16, 16384)
+        self.memory_budget_spin.setValue(DEFAULT_MEMORY_BUDGET_MB)
+        format_layout.addWidget(self.memory_budget_spin)
+
+        resample_layout = QHBoxLayout()
+        resample_layout.addWidget(QLabel("Resample to:"))
+
+        self.resample_combo = QComboBox()
+        self.resample_combo.addItems(RESAMPLE_FREQUENCIES)
+        resample_layout.addWidget(self.resample_combo)
+
+        resample_layout.addWidget(QLabel("Aggregation:"))
+
+        self.aggregation_combo = QComboBox()
+        self.aggregation_combo.addItems(RESAMPLE_AGGREGATIONS)
+        resample_layout.addWidget(self.aggregation_combo)
+
+        button_layout = QHBoxLayout()
+
+        self.filter_btn = QPushButton("Filter CSV and Save")
+        self.filter_btn.clicked.connect(self.filter_large_csv)
+
+        self.stop_btn = QPushButton("Stop")
+        self.stop_btn.setEnabled(False)
+        self.stop_btn.clicked.connect(self.stop_filtering)
+
+        button_layout.addWidget(self.filter_btn)
+        button_layout.addWidget(self.stop_btn)
+
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setValue(0)
 
+        self.throughput_label = QLabel("")
         self.status_label = QLabel("Ready")
 
         main_layout.addWidget(browse_btn)
@@ -65,7 +222,16 @@ class LargeCSVFilterApp(QMainWindow):
         main_layout.addLayout(datetime_col_layout)
         main_layout.addLayout(start_layout)
         main_layout.addLayout(end_layout)
-        main_layout.addWidget(filter_btn)
+        main_layout.addWidget(QLabel("Output Columns:"))
+        main_layout.addWidget(self.output_columns_list)
+        main_layout.addWidget(self.use_index_checkbox)
+        main_layout.addWidget(self.zone_map_checkbox)
+        main_layout.addWidget(self.stop_early_checkbox)
+        main_layout.addLayout(format_layout)
+        main_layout.addLayout(resample_layout)
+        main_layout.addLayout(button_layout)
+        main_layout.addWidget(self.progress_bar)
+        main_layout.addWidget(self.throughput_label)
         main_layout.addWidget(self.status_label)
 
         central_widget.setLayout(main_layout)
@@ -76,7 +242,7 @@ class LargeCSVFilterApp(QMainWindow):
             self,
             "Select CSV File",
             "",
-            "CSV Files (*.csv)"
+            "CSV Files (*.csv *.csv.gz *.csv.bz2 *.csv.xz)"
         )
 
         if file_path:
@@ -84,6 +250,44 @@ class LargeCSVFilterApp(QMainWindow):
             self.file_label.setText(file_path)
             self.status_label.setText("CSV file selected")
 
+            try:
+                # Small sample used to detect whether the file is time-sorted
+                self.sample_df = pd.read_csv(file_path, nrows=100)
+            except Exception:
+                self.sample_df = None
+
+            self.load_output_columns()
+            self.detect_sorted_column()
+
+    def load_output_columns(self):
+        self.output_columns_list.clear()
+
+        if self.sample_df is None:
+            return
+
+        for column in self.sample_df.columns:
+            item = QListWidgetItem(str(column))
+            item.setFlags(item.flags() | Qt.ItemIsUserCheckable)
+            item.setCheckState(Qt.Checked)
+            self.output_columns_list.addItem(item)
+
+    def selected_output_columns(self):
+        return [
+            self.output_columns_list.item(i).text()
+            for i in range(self.output_columns_list.count())
+            if self.output_columns_list.item(i).checkState() == Qt.Checked
+        ]
+
+    def detect_sorted_column(self):
+        datetime_column = self.datetime_column_input.text().strip()
+
+        if self.sample_df is None or datetime_column not in self.sample_df.columns:
+            return
+
+        self.stop_early_checkbox.setChecked(
+            looks_time_sorted(self.sample_df, datetime_column)
+        )
+
     def filter_large_csv(self):
         if not self.csv_path:
             QMessageBox.warning(self, "Missing File", "Please select a CSV file.")
@@ -110,71 +314,114 @@ class LargeCSVFilterApp(QMainWindow):
             )
             return
 
+        output_format = self.output_format_combo.currentText()
+        compression = self.selected_compression()
+        extension = output_extension(output_format, compression)
+
         output_path, _ = QFileDialog.getSaveFileName(
             self,
-            "Save Filtered CSV",
-            "filtered_output.csv",
-            "CSV Files (*.csv)"
+            f"Save Filtered {output_format}",
+            f"filtered_output{extension}",
+            f"{output_format} Files (*{extension})"
         )
 
         if not output_path:
             return
 
+        output_path = with_output_extension(output_path, output_format, compression)
+
         try:
-            chunk_size = 100000
-            first_chunk = True
-            total_rows = 0
-            filtered_rows = 0
-
-            for chunk in pd.read_csv(self.csv_path, chunksize=chunk_size):
-                total_rows += len(chunk)
-
-                if datetime_column not in chunk.columns:
-                    QMessageBox.critical(
-                        self,
-                        "Column Error",
-                        f"Column '{datetime_column}' not found in CSV."
-                    )
-                    return
-
-                chunk[datetime_column] = pd.to_datetime(
-                    chunk[datetime_column],
-                    errors="coerce"
-                )
-
-                filtered_chunk = chunk[
-                    (chunk[datetime_column] >= start_dt) &
-                    (chunk[datetime_column] <= end_dt)
-                ]
-
-                filtered_rows += len(filtered_chunk)
-
-                filtered_chunk.to_csv(
-                    output_path,
-                    mode="w" if first_chunk else "a",
-                    header=first_chunk,
-                    index=False
-                )
-
-                first_chunk = False
-
-                self.status_label.setText(
-                    f"Processed rows: {total_rows}, Filtered rows: {filtered_rows}"
-                )
-                QApplication.processEvents()
-
-            QMessageBox.information(
+            columns, _ = read_csv_header(self.csv_path)
+        except Exception as e:
+            QMessageBox.critical(self, "Error", str(e))
+            return
+
+        if datetime_column not in columns:
+            QMessageBox.critical(
                 self,
-                "Success",
-                f"Filtering completed.\n\nSaved file:\n{output_path}\n\n"
-                f"Total rows processed: {total_rows}\n"
-                f"Filtered rows saved: {filtered_rows}"
+                "Column Error",
+                f"Column '{datetime_column}' not found in CSV."
             )
+            return
 
-            self.status_label.setText("Filtering completed successfully")
+        self.worker = LargeCSVFilterWorker(
+            self.csv_path,
+            output_path,
+            datetime_column,
+            start_dt,
+            end_dt,
+            output_columns=self.selected_output_columns(),
+            use_index=self.use_index_checkbox.isChecked(),
+            stop_early=self.stop_early_checkbox.isChecked(),
+            output_format=output_format,
+            compression=compression,
+            engine=self.engine_combo.currentText(),
+            memory_budget_mb=self.memory_budget_spin.value(),
+            use_zone_map=self.zone_map_checkbox.isChecked(),
+            resample=None if self.resample_combo.currentText() == "None" else self.resample_combo.currentText(),
+            aggregation=self.aggregation_combo.currentText()
+        )
+        self.worker.progress_changed.connect(self.progress_bar.setValue)
+        self.worker.stats_changed.connect(self.update_stats)
+        self.worker.status_message.connect(self.status_label.setText)
+        self.worker.finished_processing.connect(self.filtering_finished)
+        self.worker.error_occurred.connect(self.show_error)
+
+        self.progress_bar.setValue(0)
+        self.throughput_label.setText("")
+        self.status_label.setText("Filtering...")
+        self.filter_btn.setEnabled(False)
+        self.stop_btn.setEnabled(True)
+
+        self.worker.start()
+
+    def stop_filtering(self):
+        if self.worker and self.worker.isRunning():
+            self.worker.stop()
+            self.status_label.setText("Stopping...")
+
+    def update_stats(self, stats):
+        self.status_label.setText(
+            f"Processed rows: {stats['total_rows']}, Filtered rows: {stats['filtered_rows']}"
+        )
+        self.throughput_label.setText(
+            f"{stats['rows_per_sec']:,.0f} rows/s | "
+            f"{stats['mb_per_sec']:.1f} MB/s | "
+            f"ETA {format_duration(stats['eta_seconds'])}"
+        )
 
-        except Exception as e:
-            QMessageBox.critical(self, "Error", str(e))
+    def filtering_finished(self, stats):
+        self.filter_btn.setEnabled(True)
+        self.stop_btn.setEnabled(False)
+
+        if stats["cancelled"]:
+            self.status_label.setText("Filtering cancelled, output contains a partial result")
+            return
+
+        self.progress_bar.setValue(100)
+
+        QMessageBox.information(
+            self,
+            "Success",
+            f"Filtering completed.\n\nSaved file:\n{self.worker.output_path}\n\n"
+            f"Total rows processed: {stats['total_rows']}\n"
+            f"Filtered rows saved: {stats['filtered_rows']}\n"
+            f"Elapsed: {format_duration(stats['elapsed'])}"
+        )
+
+        self.status_label.setText("Filtering completed successfully")
+
+    def show_error(self, error_message):
+        self.filter_btn.setEnabled(True)
+        self.stop_btn.setEnabled(False)
+        self.status_label.setText("Filtering failed")
+        QMessageBox.critical(self, "Error", error_message)
+
+    def closeEvent(self, event):
+        if self.worker and self.worker.isRunning():
+            self.worker.stop()
+            self.worker.wait()
+        event.accept()
 
 
 if __name__ == "__main__":
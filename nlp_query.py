@@ -4,6 +4,8 @@ from bokeh.plotting import figure, show, output_file
 from bokeh.models import ColumnDataSource, HoverTool
 from bokeh.palettes import Category10
 
+from csv_chunk_common import read_table_file
+
 
 class TimeSeriesNLPQuerySystem:
     def __init__(self, csv_file, date_column="date"):
@@ -11,10 +13,10 @@ class TimeSeriesNLPQuerySystem:
         Initialize the NLP query system.
 
         Args:
-            csv_file (str): Path to CSV file
+            csv_file (str): Path to CSV, Parquet or Feather file
             date_column (str): Name of the datetime column
         """
-        self.df = pd.read_csv(csv_file)
+        self.df = read_table_file(csv_file)
         self.date_column = date_column
 
         if self.date_column not in self.df.columns:
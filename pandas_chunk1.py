@@ -1,14 +1,81 @@
 import sys
 import os
-import pandas as pd
+import time
+from collections import deque
 
 from PyQt5.QtCore import Qt, QThread, pyqtSignal
 from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
-    QPushButton, QLabel, QFileDialog, QTextEdit, QProgressBar,
-    QMessageBox, QGridLayout, QFrame
+    QPushButton, QLabel, QFileDialog, QPlainTextEdit, QProgressBar,
+    QMessageBox, QGridLayout, QFrame, QComboBox, QLineEdit, QListWidget,
+    QSpinBox
 )
 
+from csv_accumulators import (
+    ACCUMULATOR_TYPES, DEFAULT_ACCUMULATOR_SPECS, AccumulatorSet, DistinctAccumulator,
+    PercentileAccumulator,
+    accumulate_byte_range, build_accumulator, load_accumulator_config, save_accumulator_config
+)
+from csv_chunk_common import (
+    DEFAULT_MEMORY_BUDGET_MB, ByteRangePool, ChunkPlanner, ProgressFile, input_compression
+)
+from csv_time_index import read_csv_header
+
+
+# Lines kept in the log view; older lines scroll out
+LOG_VIEW_LINES = 1000
+UPDATE_INTERVAL_SECONDS = 0.1
+# Running results are published to the cards at most this often
+SNAPSHOT_INTERVAL_SECONDS = 1.0
+
+
+class SignalBatcher:
+    """
+    Coalesce a worker's log lines and progress into UI updates sent at most
+    every interval seconds, so the UI cost no longer grows with the number
+    of chunks. Only the latest max_lines pending lines are kept; the rest
+    would scroll out of the log view anyway and are reported as skipped.
+    """
+
+    def __init__(self, emit_log, emit_progress, interval=UPDATE_INTERVAL_SECONDS,
+                 max_lines=LOG_VIEW_LINES):
+        self.emit_log = emit_log
+        self.emit_progress = emit_progress
+        self.interval = interval
+        self.lines = deque(maxlen=max_lines)
+        self.skipped_lines = 0
+        self.percent = None
+        self.sent_percent = None
+        self.last_flush = 0.0
+
+    def log(self, message):
+        if len(self.lines) == self.lines.maxlen:
+            self.skipped_lines += 1
+        self.lines.append(message)
+        self.flush()
+
+    def progress(self, percent):
+        self.percent = percent
+        self.flush()
+
+    def flush(self, force=False):
+        now = time.monotonic()
+        if not force and now - self.last_flush < self.interval:
+            return
+        self.last_flush = now
+
+        if self.percent is not None and self.percent != self.sent_percent:
+            self.emit_progress(self.percent)
+            self.sent_percent = self.percent
+
+        if self.lines:
+            lines = list(self.lines)
+            if self.skipped_lines:
+                lines.insert(0, f"... {self.skipped_lines} log lines skipped")
+            self.emit_log("\n".join(lines))
+            self.lines.clear()
+            self.skipped_lines = 0
+
 
 class CSVChunkWorker(QThread):
     progress_changed = pyqtSignal(int)
@@ -17,85 +84,145 @@ class CSVChunkWorker(QThread):
     finished_processing = pyqtSignal()
     error_occurred = pyqtSignal(str)
 
-    def __init__(self, file_path, chunk_size=1000):
+    def __init__(self, file_path, memory_budget_mb=DEFAULT_MEMORY_BUDGET_MB,
+                 metric_specs=None, workers=1, snapshot_interval=SNAPSHOT_INTERVAL_SECONDS):
         super().__init__()
         self.file_path = file_path
-        self.chunk_size = chunk_size
+        self.memory_budget_mb = memory_budget_mb
+        self.metric_specs = metric_specs if metric_specs is not None else DEFAULT_ACCUMULATOR_SPECS
+        self.workers = workers
         self.is_running = True
+        self.updates = SignalBatcher(self.log_message.emit, self.progress_changed.emit)
+        self.snapshot_interval = snapshot_interval
+        self.last_snapshot = 0.0
 
     def stop(self):
         self.is_running = False
 
+    def build_stats(self, total_records, total_chunks, accumulators, partial):
+        return {
+            "total_records": total_records,
+            "total_chunks": total_chunks,
+            "metrics": accumulators.results(),
+            "distinct_values": {
+                accumulator.label: accumulator.describe_values()
+                for accumulator in accumulators.accumulators
+                if isinstance(accumulator, DistinctAccumulator)
+            },
+            "partial": partial
+        }
+
+    def publish_snapshot(self, total_records, total_chunks, accumulators):
+        """Send the running results to the dashboard, at most every snapshot_interval seconds."""
+        now = time.monotonic()
+        if now - self.last_snapshot < self.snapshot_interval:
+            return
+
+        self.last_snapshot = now
+        self.stats_ready.emit(self.build_stats(total_records, total_chunks, accumulators, True))
+
     def run(self):
         try:
             if not os.path.exists(self.file_path):
                 raise FileNotFoundError("Selected file does not exist.")
 
-            total_rows = self.count_rows(self.file_path)
-            if total_rows == 0:
+            file_size = os.path.getsize(self.file_path)
+            if file_size == 0:
                 raise ValueError("CSV file is empty.")
 
-            processed_rows = 0
-            total_chunks = 0
+            self.updates.log(f"Started processing: {self.file_path}")
+            self.updates.log(f"File size: {file_size / (1024 * 1024):.1f} MB")
 
-            # Example dashboard metrics
-            total_records = 0
-            high_temp_count = 0
-            avg_temp_sum = 0
-            avg_temp_count = 0
-            unique_zones = set()
+            if self.workers > 1 and input_compression(self.file_path):
+                self.updates.log("Compressed input cannot be split, processing sequentially.")
 
-            self.log_message.emit(f"Started processing: {self.file_path}")
-            self.log_message.emit(f"Total rows detected: {total_rows}")
+            if self.workers > 1 and not input_compression(self.file_path):
+                outcome = self.run_parallel()
+            else:
+                outcome = self.run_sequential()
 
-            for chunk in pd.read_csv(self.file_path, chunksize=self.chunk_size):
-                if not self.is_running:
-                    self.log_message.emit("Processing stopped by user.")
-                    return
+            if outcome is None:
+                self.updates.log("Processing stopped by user.")
+                self.updates.flush(force=True)
+                return
 
-                total_chunks += 1
-                chunk_rows = len(chunk)
-                processed_rows += chunk_rows
-                total_records += chunk_rows
-
-                self.log_message.emit(f"Processing chunk {total_chunks} with {chunk_rows} rows")
-
-                # Example processing logic
-                # Expected columns: timestamp, zone, temperature
-                if "temperature" in chunk.columns:
-                    high_temp_count += (chunk["temperature"] > 30).sum()
-                    avg_temp_sum += chunk["temperature"].sum()
-                    avg_temp_count += chunk["temperature"].count()
-
-                if "zone" in chunk.columns:
-                    unique_zones.update(chunk["zone"].dropna().astype(str).unique())
-
-                percent = int((processed_rows / total_rows) * 100)
-                self.progress_changed.emit(percent)
-
-            avg_temperature = round(avg_temp_sum / avg_temp_count, 2) if avg_temp_count > 0 else 0
-
-            stats = {
-                "total_records": total_records,
-                "total_chunks": total_chunks,
-                "high_temp_count": int(high_temp_count),
-                "avg_temperature": avg_temperature,
-                "unique_zone_count": len(unique_zones),
-                "zones": ", ".join(sorted(unique_zones)) if unique_zones else "N/A"
-            }
+            total_records, total_chunks, accumulators = outcome
+            stats = self.build_stats(total_records, total_chunks, accumulators, False)
 
+            self.updates.log("Processing completed successfully.")
+            self.updates.flush(force=True)
             self.stats_ready.emit(stats)
-            self.log_message.emit("Processing completed successfully.")
             self.finished_processing.emit()
 
         except Exception as e:
+            self.updates.flush(force=True)
             self.error_occurred.emit(str(e))
 
-    def count_rows(self, file_path):
-        # Count data rows excluding header
-        with open(file_path, "r", encoding="utf-8") as f:
-            row_count = sum(1 for _ in f) - 1
-        return max(row_count, 0)
+    def run_sequential(self):
+        accumulators = AccumulatorSet(self.metric_specs)
+        chunk_planner = ChunkPlanner(self.memory_budget_mb)
+        total_records = 0
+        total_chunks = 0
+
+        with ProgressFile(self.file_path) as source:
+            for chunk in chunk_planner.read_csv(source.handle):
+                if not self.is_running:
+                    # Leave the cards on the results up to this point
+                    self.stats_ready.emit(self.build_stats(total_records, total_chunks, accumulators, True))
+                    return None
+
+                total_chunks += 1
+                total_records += len(chunk)
+
+                self.updates.log(f"Processing chunk {total_chunks} with {len(chunk)} rows")
+
+                accumulators.update(chunk)
+
+                # Progress from bytes consumed, no separate row-count pass
+                self.updates.progress(source.percent())
+                self.publish_snapshot(total_records, total_chunks, accumulators)
+
+        return total_records, total_chunks, accumulators
+
+    def run_parallel(self):
+        """
+        Run fresh accumulators over newline-aligned byte ranges in a process
+        pool and merge their partial states, which gives the same results as
+        one sequential pass (percentiles to within the t-digest error). The
+        dashboard sees merged results whenever a range finishes.
+        """
+        columns, data_offset = read_csv_header(self.file_path)
+        pool = ByteRangePool(self.file_path, data_offset, self.workers, self.memory_budget_mb)
+
+        self.updates.log(f"Parallel mode: {len(pool.ranges)} ranges on {self.workers} worker processes")
+
+        accumulators = AccumulatorSet(self.metric_specs)
+        total_records = 0
+        total_chunks = 0
+
+        range_args = [
+            (self.file_path, columns, start, stop, self.metric_specs, pool.worker_budget_mb)
+            for start, stop in pool.ranges
+        ]
+
+        for finished in pool.run(accumulate_byte_range, range_args):
+            if not self.is_running:
+                self.stats_ready.emit(self.build_stats(total_records, total_chunks, accumulators, True))
+                return None
+
+            for _, (range_rows, range_chunks, partial) in finished:
+                accumulators.merge(partial)
+                total_records += range_rows
+                total_chunks += range_chunks
+
+                self.updates.log(f"Merged range with {range_rows} rows")
+                self.updates.progress(pool.percent())
+
+            # Merged ranges so far; ranges still running show up once they finish
+            if finished:
+                self.publish_snapshot(total_records, total_chunks, accumulators)
+
+        return total_records, total_chunks, accumulators
 
 
 class DashboardCard(QFrame):
@@ -132,6 +259,8 @@ class MainWindow(QMainWindow):
 
         self.file_path = ""
         self.worker = None
+        self.metric_specs = [dict(spec) for spec in DEFAULT_ACCUMULATOR_SPECS]
+        self.metric_cards = {}
 
         self.init_ui()
         self.apply_dark_theme()
@@ -159,41 +288,113 @@ class MainWindow(QMainWindow):
         controls_layout.addWidget(self.start_button)
         controls_layout.addWidget(self.stop_button)
 
+        # Metric configuration
+        metric_layout = QHBoxLayout()
+
+        self.metric_type_combo = QComboBox()
+        self.metric_type_combo.addItems(list(ACCUMULATOR_TYPES))
+
+        self.metric_column_combo = QComboBox()
+        self.metric_column_combo.setEditable(True)
+
+        self.metric_where_edit = QLineEdit()
+        self.metric_where_edit.setPlaceholderText("Count condition, e.g. > 30")
+
+        # Distinct counts switch from an exact set to HyperLogLog above the limit
+        self.distinct_precision_spin = QSpinBox()
+        self.distinct_precision_spin.setRange(
+            DistinctAccumulator.MIN_PRECISION, DistinctAccumulator.MAX_PRECISION
+        )
+        self.distinct_precision_spin.setValue(DistinctAccumulator.DEFAULT_PRECISION)
+        self.distinct_precision_spin.setPrefix("HLL precision ")
+
+        self.distinct_limit_spin = QSpinBox()
+        self.distinct_limit_spin.setRange(0, 10000000)
+        self.distinct_limit_spin.setSingleStep(1000)
+        self.distinct_limit_spin.setValue(DistinctAccumulator.DEFAULT_EXACT_LIMIT)
+        self.distinct_limit_spin.setPrefix("Exact up to ")
+
+        self.percentiles_edit = QLineEdit(
+            ", ".join(str(p) for p in PercentileAccumulator.DEFAULT_PERCENTILES)
+        )
+        self.percentiles_edit.setPlaceholderText("Percentiles, e.g. 50, 95, 99")
+
+        self.metric_type_combo.currentTextChanged.connect(self.update_metric_options)
+
+        self.add_metric_button = QPushButton("Add Metric")
+        self.remove_metric_button = QPushButton("Remove Metric")
+        self.load_metrics_button = QPushButton("Load Config")
+        self.save_metrics_button = QPushButton("Save Config")
+
+        self.add_metric_button.clicked.connect(self.add_metric)
+        self.remove_metric_button.clicked.connect(self.remove_metric)
+        self.load_metrics_button.clicked.connect(self.load_metrics)
+        self.save_metrics_button.clicked.connect(self.save_metrics)
+
+        metric_layout.addWidget(QLabel("Metric:"))
+        metric_layout.addWidget(self.metric_type_combo)
+        metric_layout.addWidget(QLabel("Column:"))
+        metric_layout.addWidget(self.metric_column_combo)
+        metric_layout.addWidget(self.metric_where_edit)
+        metric_layout.addWidget(self.distinct_precision_spin)
+        metric_layout.addWidget(self.distinct_limit_spin)
+        metric_layout.addWidget(self.percentiles_edit)
+        metric_layout.addWidget(self.add_metric_button)
+        metric_layout.addWidget(self.remove_metric_button)
+        metric_layout.addWidget(self.load_metrics_button)
+        metric_layout.addWidget(self.save_metrics_button)
+
+        self.metric_list = QListWidget()
+        self.metric_list.setMaximumHeight(90)
+
+        # Merged results are identical however the file is split
+        workers_layout = QHBoxLayout()
+        self.workers_spin = QSpinBox()
+        self.workers_spin.setRange(1, os.cpu_count() or 1)
+        self.workers_spin.setValue(1)
+        workers_layout.addWidget(QLabel("Worker processes:"))
+        workers_layout.addWidget(self.workers_spin)
+        workers_layout.addStretch()
+
         # Progress bar
         self.progress_bar = QProgressBar()
         self.progress_bar.setValue(0)
 
-        # Dashboard cards
+        # Dashboard cards: fixed totals, then one card per metric
         cards_layout = QGridLayout()
         self.total_records_card = DashboardCard("Total Records", "0")
         self.total_chunks_card = DashboardCard("Total Chunks", "0")
-        self.high_temp_card = DashboardCard("Temp > 30", "0")
-        self.avg_temp_card = DashboardCard("Avg Temperature", "0")
-        self.unique_zone_card = DashboardCard("Unique Zones", "0")
 
         cards_layout.addWidget(self.total_records_card, 0, 0)
         cards_layout.addWidget(self.total_chunks_card, 0, 1)
-        cards_layout.addWidget(self.high_temp_card, 0, 2)
-        cards_layout.addWidget(self.avg_temp_card, 1, 0)
-        cards_layout.addWidget(self.unique_zone_card, 1, 1)
 
-        # Zone display
-        self.zone_label = QLabel("Zones: N/A")
-        self.zone_label.setStyleSheet("font-size: 14px; padding: 8px;")
+        self.metric_cards_layout = QGridLayout()
+
+        # Distinct value display
+        self.distinct_values_label = QLabel("Distinct values: N/A")
+        self.distinct_values_label.setStyleSheet("font-size: 14px; padding: 8px;")
 
         # Log area
-        self.log_area = QTextEdit()
+        self.log_area = QPlainTextEdit()
         self.log_area.setReadOnly(True)
+        self.log_area.setMaximumBlockCount(LOG_VIEW_LINES)
 
         main_layout.addLayout(controls_layout)
+        main_layout.addLayout(metric_layout)
+        main_layout.addWidget(self.metric_list)
+        main_layout.addLayout(workers_layout)
         main_layout.addWidget(self.progress_bar)
         main_layout.addLayout(cards_layout)
-        main_layout.addWidget(self.zone_label)
+        main_layout.addLayout(self.metric_cards_layout)
+        main_layout.addWidget(self.distinct_values_label)
         main_layout.addWidget(QLabel("Processing Log"))
         main_layout.addWidget(self.log_area)
 
         central_widget.setLayout(main_layout)
 
+        self.update_metric_options(self.metric_type_combo.currentText())
+        self.refresh_metrics()
+
     def apply_dark_theme(self):
         self.setStyleSheet("""
             QMainWindow, QWidget {
@@ -214,7 +415,7 @@ class MainWindow(QMainWindow):
             QLabel {
                 color: white;
             }
-            QTextEdit {
+            QPlainTextEdit {
                 background-color: #252526;
                 color: #dcdcdc;
                 border: 1px solid #444;
@@ -237,12 +438,133 @@ class MainWindow(QMainWindow):
             self,
             "Select CSV File",
             "",
-            "CSV Files (*.csv)"
+            "CSV Files (*.csv *.csv.gz *.csv.bz2 *.csv.xz)"
         )
         if file_path:
             self.file_path = file_path
             self.file_label.setText(file_path)
-            self.log_area.append(f"Selected file: {file_path}")
+            self.log_area.appendPlainText(f"Selected file: {file_path}")
+
+            try:
+                columns, _ = read_csv_header(file_path)
+            except Exception as e:
+                self.log_area.appendPlainText(f"Error while loading CSV header: {e}")
+                return
+
+            self.metric_column_combo.clear()
+            self.metric_column_combo.addItems(columns)
+
+    def refresh_metrics(self):
+        """Rebuild the metric list and the dashboard cards of every metric."""
+        self.metric_list.clear()
+        for spec in self.metric_specs:
+            accumulator = build_accumulator(spec)
+            where = f" where {spec['where']}" if spec.get("where") else ""
+            column = f" of {spec['column']}" if spec.get("column") else ""
+            sketch = ""
+            if isinstance(accumulator, DistinctAccumulator):
+                sketch = f" (exact up to {accumulator.exact_limit}, then HLL p={accumulator.precision})"
+            elif isinstance(accumulator, PercentileAccumulator):
+                percentiles = ", ".join(f"p{p:g}" for p in accumulator.percentiles)
+                sketch = f" {percentiles} (t-digest, compression {accumulator.compression:g})"
+            self.metric_list.addItem(f"{accumulator.label}: {spec['type']}{column}{where}{sketch}")
+
+        for card in self.metric_cards.values():
+            self.metric_cards_layout.removeWidget(card)
+            card.deleteLater()
+
+        self.metric_cards = {}
+        labels = [
+            label
+            for accumulator in AccumulatorSet(self.metric_specs).accumulators
+            for label in accumulator.result_labels()
+        ]
+        for i, label in enumerate(labels):
+            card = DashboardCard(label, "0")
+            self.metric_cards[label] = card
+            self.metric_cards_layout.addWidget(card, i // 3, i % 3)
+
+    def update_metric_options(self, metric_type):
+        self.metric_where_edit.setEnabled(metric_type == "count")
+        self.distinct_precision_spin.setEnabled(metric_type == "distinct")
+        self.distinct_limit_spin.setEnabled(metric_type == "distinct")
+        self.percentiles_edit.setEnabled(metric_type == "percentile")
+
+    def add_metric(self):
+        spec = {"type": self.metric_type_combo.currentText()}
+
+        column = self.metric_column_combo.currentText().strip()
+        if column:
+            spec["column"] = column
+
+        where = self.metric_where_edit.text().strip()
+        if where and spec["type"] == "count":
+            spec["where"] = where
+
+        if spec["type"] == "distinct":
+            spec["precision"] = self.distinct_precision_spin.value()
+            spec["exact_limit"] = self.distinct_limit_spin.value()
+
+        try:
+            if spec["type"] == "percentile":
+                spec["percentiles"] = [
+                    float(p) for p in self.percentiles_edit.text().replace(",", " ").split()
+                ]
+
+            spec = build_accumulator(spec).spec()
+            AccumulatorSet(self.metric_specs + [spec])
+        except ValueError as e:
+            QMessageBox.warning(self, "Warning", str(e))
+            return
+
+        self.metric_specs.append(spec)
+        self.metric_where_edit.clear()
+        self.refresh_metrics()
+
+    def remove_metric(self):
+        row = self.metric_list.currentRow()
+        if row < 0:
+            return
+
+        del self.metric_specs[row]
+        self.refresh_metrics()
+
+    def load_metrics(self):
+        file_path, _ = QFileDialog.getOpenFileName(
+            self,
+            "Load Metrics Config",
+            "",
+            "JSON Files (*.json);;All Files (*)"
+        )
+        if not file_path:
+            return
+
+        try:
+            self.metric_specs = load_accumulator_config(file_path)
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Failed to load metrics config.\n\n{str(e)}")
+            return
+
+        self.refresh_metrics()
+        self.log_area.appendPlainText(f"Loaded {len(self.metric_specs)} metrics from: {file_path}")
+
+    def save_metrics(self):
+        file_path, _ = QFileDialog.getSaveFileName(
+            self,
+            "Save Metrics Config",
+            "metrics.json",
+            "JSON Files (*.json);;All Files (*)"
+        )
+        if not file_path:
+            return
+
+        try:
+            save_accumulator_config(file_path, AccumulatorSet(self.metric_specs).specs())
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Failed to save metrics config.\n\n{str(e)}")
+            return
+
+        self.log_area.appendPlainText(f"Saved metrics config: {file_path}")
 
     def start_processing(self):
         if not self.file_path:
@@ -253,43 +575,57 @@ class MainWindow(QMainWindow):
         self.log_area.clear()
         self.reset_dashboard()
 
-        self.worker = CSVChunkWorker(self.file_path, chunk_size=1000)
+        self.worker = CSVChunkWorker(
+            self.file_path, metric_specs=self.metric_specs, workers=self.workers_spin.value()
+        )
         self.worker.progress_changed.connect(self.progress_bar.setValue)
-        self.worker.log_message.connect(self.log_area.append)
+        self.worker.log_message.connect(self.log_area.appendPlainText)
         self.worker.stats_ready.connect(self.update_dashboard)
         self.worker.finished_processing.connect(self.processing_finished)
         self.worker.error_occurred.connect(self.show_error)
         self.worker.start()
 
-        self.log_area.append("Worker thread started.")
+        self.log_area.appendPlainText("Worker thread started.")
 
     def stop_processing(self):
         if self.worker and self.worker.isRunning():
             self.worker.stop()
-            self.log_area.append("Stopping worker...")
+            self.log_area.appendPlainText("Stopping worker...")
 
     def reset_dashboard(self):
+        self.statusBar().clearMessage()
         self.total_records_card.set_value("0")
         self.total_chunks_card.set_value("0")
-        self.high_temp_card.set_value("0")
-        self.avg_temp_card.set_value("0")
-        self.unique_zone_card.set_value("0")
-        self.zone_label.setText("Zones: N/A")
+        for card in self.metric_cards.values():
+            card.set_value("0")
+        self.distinct_values_label.setText("Distinct values: N/A")
 
     def update_dashboard(self, stats):
+        if stats.get("partial") and self.worker and not self.worker.is_running:
+            self.statusBar().showMessage(f"Stopped: partial results from {stats['total_records']} records")
+        elif stats.get("partial"):
+            self.statusBar().showMessage(
+                f"Live results from {stats['total_records']} records so far, updating..."
+            )
+        else:
+            self.statusBar().showMessage(f"Final results from {stats['total_records']} records")
+
         self.total_records_card.set_value(stats["total_records"])
         self.total_chunks_card.set_value(stats["total_chunks"])
-        self.high_temp_card.set_value(stats["high_temp_count"])
-        self.avg_temp_card.set_value(stats["avg_temperature"])
-        self.unique_zone_card.set_value(stats["unique_zone_count"])
-        self.zone_label.setText(f"Zones: {stats['zones']}")
+        for label, value in stats["metrics"].items():
+            if label in self.metric_cards:
+                self.metric_cards[label].set_value(value)
+        self.distinct_values_label.setText(
+            "\n".join(f"{label}: {values}" for label, values in stats["distinct_values"].items())
+            or "Distinct values: N/A"
+        )
 
     def processing_finished(self):
-        self.log_area.append("All chunks processed.")
+        self.log_area.appendPlainText("All chunks processed.")
         QMessageBox.information(self, "Done", "CSV chunk processing completed.")
 
     def show_error(self, error_message):
-        self.log_area.append(f"Error: {error_message}")
+        self.log_area.appendPlainText(f"Error: {error_message}")
         QMessageBox.critical(self, "Error", error_message)
 
 
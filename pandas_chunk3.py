@@ -1,15 +1,18 @@
 import sys
 import os
+import shutil
+import tempfile
 from datetime import datetime
 
 import pandas as pd
-from PyQt5.QtCore import QDateTime
+from PyQt5.QtCore import QDateTime, Qt, QTimer
 from PyQt5.QtWidgets import (
     QApplication,
     QWidget,
     QLabel,
     QPushButton,
     QFileDialog,
+    QInputDialog,
     QVBoxLayout,
     QHBoxLayout,
     QMessageBox,
@@ -17,17 +20,185 @@ from PyQt5.QtWidgets import (
     QComboBox,
     QProgressBar,
     QTextEdit,
+    QCheckBox,
+    QSpinBox,
+    QListWidget,
+    QListWidgetItem,
 )
 
+from csv_asof_join import JOIN_DIRECTIONS, asof_join_csv, joined_output_path
+from csv_chunk_common import (
+    CSV_ENGINES,
+    DEFAULT_MEMORY_BUDGET_MB,
+    OUTPUT_FORMATS,
+    PARTITION_PERIODS,
+    RESAMPLE_AGGREGATIONS,
+    RESAMPLE_FREQUENCIES,
+    ByteRangePool,
+    ChunkPlanner,
+    CompressionOptionsMixin,
+    DatetimeParser,
+    ProgressFile,
+    TimeOrderCheck,
+    TimeWindowRouter,
+    input_compression,
+    iter_filtered_chunks,
+    load_time_windows,
+    looks_time_sorted,
+    open_byte_range,
+    open_chunk_writer,
+    output_extension,
+    parse_time_windows,
+    projected_columns,
+    strip_data_extensions,
+)
+from csv_datetime_filter import (
+    filtered_output_path, filter_csv_by_datetime, follow_csv_by_datetime, follow_output_path,
+    partitions_output_dir
+)
+from csv_external_sort import sort_csv_by_datetime, sorted_output_path
+from csv_time_index import read_csv_header
+
+
+def filter_byte_range(csv_path, columns, start, stop, datetime_column,
+                      start_dt, end_dt, memory_budget_mb, part_path, stop_early=False,
+                      usecols=None, output_format="CSV", engine="pandas"):
+    """
+    Filter one newline-aligned byte range of a CSV into a part file in the
+    output format; no file is created when nothing matches. Runs inside a
+    worker process, so it must stay at module level. Returns
+    (processed_rows, matched_rows, in_order), where in_order is False when
+    early exit was requested but the range turned out not to be sorted.
+    """
+    processed_rows = 0
+    matched_rows = 0
+    order_check = TimeOrderCheck() if stop_early else None
+
+    with open_byte_range(csv_path, start, stop) as handle:
+        chunks = iter_filtered_chunks(
+            engine,
+            handle,
+            datetime_column,
+            start_dt,
+            end_dt,
+            usecols=usecols,
+            column_names=columns,
+            chunk_planner=ChunkPlanner(memory_budget_mb),
+            order_check=order_check
+        )
+
+        writer = open_chunk_writer(part_path, output_format)
+
+        try:
+            for rows_read, chunk_min, filtered_chunk in chunks:
+                if stop_early and not order_check.in_order:
+                    stop_early = False
+
+                if stop_early and chunk_min > end_dt:
+                    break
+
+                if not filtered_chunk.empty:
+                    writer.write(filtered_chunk)
+                    matched_rows += len(filtered_chunk)
+
+                processed_rows += rows_read
+        finally:
+            writer.close()
+
+    return processed_rows, matched_rows, order_check is None or order_check.in_order
+
+
+def route_windows_into(handle, columns, datetime_column, windows, memory_budget_mb,
+                       open_writer, stop_early=False, usecols=None, engine="pandas",
+                       on_chunk=None):
+    """
+    Read a CSV handle with the chosen engine and write every row to each
+    time window containing it. open_writer(window) is called the first time
+    a window gets rows and on_chunk(processed_rows, window_rows) after every
+    chunk. Returns (processed_rows, window_rows, in_order) like
+    filter_byte_range.
+    """
+    router = TimeWindowRouter(windows)
+    order_check = TimeOrderCheck() if stop_early else None
+    routing_parser = DatetimeParser()
+    writers = {}
+    window_rows = [0] * len(windows)
+    processed_rows = 0
+
+    chunks = iter_filtered_chunks(
+        engine,
+        handle,
+        datetime_column,
+        min(start for start, _ in windows),
+        router.max_end,
+        usecols=usecols,
+        column_names=columns,
+        chunk_planner=ChunkPlanner(memory_budget_mb),
+        order_check=order_check
+    )
 
-class CSVChunkFilterApp(QWidget):
+    try:
+        for rows_read, chunk_min, filtered_chunk in chunks:
+            if stop_early and not order_check.in_order:
+                stop_early = False
+
+            if stop_early and chunk_min > router.max_end:
+                break
+
+            processed_rows += rows_read
+
+            if filtered_chunk.empty:
+                # The routing parser must first see rows to detect epoch columns
+                if on_chunk is not None:
+                    on_chunk(processed_rows, window_rows)
+                continue
+
+            # Epoch columns are written as read, only the routing needs datetimes
+            timestamps = routing_parser.parse(filtered_chunk[datetime_column])
+
+            for window, positions in router.route(timestamps).items():
+                if window not in writers:
+                    writers[window] = open_writer(window)
+
+                writers[window].write(filtered_chunk.iloc[positions])
+                window_rows[window] += len(positions)
+
+            if on_chunk is not None:
+                on_chunk(processed_rows, window_rows)
+    finally:
+        for writer in writers.values():
+            writer.close()
+
+    return processed_rows, window_rows, order_check is None or order_check.in_order
+
+
+def route_byte_range(csv_path, columns, start, stop, datetime_column, windows,
+                     memory_budget_mb, part_paths, stop_early=False, usecols=None,
+                     output_format="CSV", engine="pandas"):
+    """
+    Multi-window pass over one byte range, with one part file per window in
+    part_paths. Runs inside a worker process, like filter_byte_range.
+    """
+    with open_byte_range(csv_path, start, stop) as handle:
+        return route_windows_into(
+            handle, columns, datetime_column, windows, memory_budget_mb,
+            lambda window: open_chunk_writer(part_paths[window], output_format),
+            stop_early, usecols, engine
+        )
+
+
+class CSVChunkFilterApp(CompressionOptionsMixin, QWidget):
     def __init__(self):
         super().__init__()
         self.setWindowTitle("Large CSV Filter using Chunking")
-        self.resize(750, 420)
+        self.resize(750, 680)
 
         self.csv_file_path = ""
-        self.chunk_size = 50000
+        self.sample_df = None
+        self.follow_request = None
+
+        self.follow_timer = QTimer(self)
+        self.follow_timer.timeout.connect(self.refresh_follow)
 
         self.init_ui()
 
@@ -48,6 +219,7 @@ class CSVChunkFilterApp(QWidget):
         column_label = QLabel("Datetime Column:")
         self.column_combo = QComboBox()
         self.column_combo.setEnabled(False)
+        self.column_combo.currentTextChanged.connect(self.detect_sorted_column)
 
         column_layout.addWidget(column_label)
         column_layout.addWidget(self.column_combo)
@@ -74,10 +246,132 @@ class CSVChunkFilterApp(QWidget):
         end_layout.addWidget(end_label)
         end_layout.addWidget(self.end_datetime)
 
+        # Optional multi-window extraction, one "start, end" per line
+        windows_header_layout = QHBoxLayout()
+        windows_label = QLabel("Time Windows (optional, single pass):")
+        self.load_windows_button = QPushButton("Load Windows File")
+        self.load_windows_button.clicked.connect(self.browse_windows_file)
+
+        windows_header_layout.addWidget(windows_label)
+        windows_header_layout.addWidget(self.load_windows_button)
+
+        self.windows_input = QTextEdit()
+        self.windows_input.setAcceptRichText(False)
+        self.windows_input.setMaximumHeight(80)
+        self.windows_input.setPlaceholderText(
+            "2024-01-01 10:00:00, 2024-01-01 11:00:00\n"
+            "Leave empty to use the start/end datetime above"
+        )
+
+        # Output column selection, only checked columns are parsed and written
+        self.output_columns_list = QListWidget()
+        self.output_columns_list.setMaximumHeight(120)
+
+        # Early exit for time-sorted files, auto-detected from the sample
+        self.sorted_checkbox = QCheckBox("CSV sorted by datetime (stop after end datetime)")
+
+        # Parallel mode
+        parallel_layout = QHBoxLayout()
+        self.parallel_checkbox = QCheckBox("Parallel mode")
+        self.workers_spin = QSpinBox()
+        self.workers_spin.setRange(1, max(os.cpu_count() or 1, 1))
+        self.workers_spin.setValue(os.cpu_count() or 1)
+
+        parallel_layout.addWidget(self.parallel_checkbox)
+        parallel_layout.addWidget(QLabel("Worker processes:"))
+        parallel_layout.addWidget(self.workers_spin)
+
+        # Chunk sizes are planned from this budget; parallel workers share it
+        self.memory_budget_spin = QSpinBox()
+        self.memory_budget_spin.setRange(16, 16384)
+        self.memory_budget_spin.setValue(DEFAULT_MEMORY_BUDGET_MB)
+
+        parallel_layout.addWidget(QLabel("Memory budget (MB):"))
+        parallel_layout.addWidget(self.memory_budget_spin)
+
+        # CSV engine and output format
+        format_layout = QHBoxLayout()
+        format_layout.addWidget(QLabel("CSV Engine:"))
+        self.engine_combo = QComboBox()
+        self.engine_combo.addItems(CSV_ENGINES)
+        format_layout.addWidget(self.engine_combo)
+        format_layout.addWidget(QLabel("Output Format:"))
+        self.output_format_combo = QComboBox()
+        self.output_format_combo.addItems(list(OUTPUT_FORMATS))
+        self.output_format_combo.currentTextChanged.connect(self.update_compression_state)
+        format_layout.addWidget(self.output_format_combo)
+        format_layout.addWidget(QLabel("CSV Compression:"))
+        self.compression_combo = QComboBox()
+        self.compression_combo.addItems(["None", "gzip", "bz2", "xz"])
+        format_layout.addWidget(self.compression_combo)
+
+        # Time-partitioned output
+        partition_layout = QHBoxLayout()
+        partition_layout.addWidget(QLabel("Partition output by:"))
+        self.partition_combo = QComboBox()
+        self.partition_combo.addItems(PARTITION_PERIODS)
+        partition_layout.addWidget(self.partition_combo)
+        partition_layout.addWidget(QLabel("Max open partition files:"))
+        self.max_open_files_spin = QSpinBox()
+        self.max_open_files_spin.setRange(1, 1024)
+        self.max_open_files_spin.setValue(64)
+        partition_layout.addWidget(self.max_open_files_spin)
+
+        # Streaming resample of the filtered rows
+        resample_layout = QHBoxLayout()
+        resample_layout.addWidget(QLabel("Resample to:"))
+        self.resample_combo = QComboBox()
+        self.resample_combo.addItems(RESAMPLE_FREQUENCIES)
+        resample_layout.addWidget(self.resample_combo)
+        resample_layout.addWidget(QLabel("Aggregation:"))
+        self.aggregation_combo = QComboBox()
+        self.aggregation_combo.addItems(RESAMPLE_AGGREGATIONS)
+        resample_layout.addWidget(self.aggregation_combo)
+
+        # Follow mode for CSVs that keep growing
+        follow_layout = QHBoxLayout()
+        self.follow_checkbox = QCheckBox("Follow mode (append rows added since the last refresh)")
+        self.follow_interval_spin = QSpinBox()
+        self.follow_interval_spin.setRange(5, 3600)
+        self.follow_interval_spin.setValue(60)
+        self.follow_interval_spin.setSuffix(" s")
+
+        follow_layout.addWidget(self.follow_checkbox)
+        follow_layout.addWidget(QLabel("Refresh every:"))
+        follow_layout.addWidget(self.follow_interval_spin)
+
         # Generate button
         self.generate_button = QPushButton("Generate New CSV")
         self.generate_button.clicked.connect(self.generate_filtered_csv)
 
+        # Sort mode for files that arrive out of order
+        self.sort_button = QPushButton("Sort CSV by Datetime")
+        self.sort_button.clicked.connect(self.sort_csv_file)
+
+        # As-of join with a second time-sorted CSV
+        self.join_button = QPushButton("Join with CSV...")
+        self.join_button.clicked.connect(self.join_csv_file)
+
+        self.join_direction_combo = QComboBox()
+        self.join_direction_combo.addItems(JOIN_DIRECTIONS)
+
+        self.join_tolerance_spin = QSpinBox()
+        self.join_tolerance_spin.setRange(0, 86400000)
+        self.join_tolerance_spin.setValue(0)
+        self.join_tolerance_spin.setSuffix(" ms")
+        self.join_tolerance_spin.setSpecialValueText("No limit")
+
+        join_layout = QHBoxLayout()
+        join_layout.addWidget(QLabel("Join direction:"))
+        join_layout.addWidget(self.join_direction_combo)
+        join_layout.addWidget(QLabel("Tolerance:"))
+        join_layout.addWidget(self.join_tolerance_spin)
+
+        button_layout = QHBoxLayout()
+        button_layout.addWidget(self.generate_button)
+        button_layout.addWidget(self.sort_button)
+        button_layout.addWidget(self.join_button)
+
         # Progress bar
         self.progress_bar = QProgressBar()
         self.progress_bar.setValue(0)
@@ -90,7 +384,18 @@ class CSVChunkFilterApp(QWidget):
         main_layout.addLayout(column_layout)
         main_layout.addLayout(start_layout)
         main_layout.addLayout(end_layout)
-        main_layout.addWidget(self.generate_button)
+        main_layout.addLayout(windows_header_layout)
+        main_layout.addWidget(self.windows_input)
+        main_layout.addWidget(QLabel("Output Columns:"))
+        main_layout.addWidget(self.output_columns_list)
+        main_layout.addWidget(self.sorted_checkbox)
+        main_layout.addLayout(parallel_layout)
+        main_layout.addLayout(format_layout)
+        main_layout.addLayout(partition_layout)
+        main_layout.addLayout(resample_layout)
+        main_layout.addLayout(follow_layout)
+        main_layout.addLayout(join_layout)
+        main_layout.addLayout(button_layout)
         main_layout.addWidget(self.progress_bar)
         main_layout.addWidget(self.log_area)
 
@@ -105,7 +410,7 @@ class CSVChunkFilterApp(QWidget):
             self,
             "Select CSV File",
             "",
-            "CSV Files (*.csv);;All Files (*)"
+            "CSV Files (*.csv *.csv.gz *.csv.bz2 *.csv.xz);;All Files (*)"
         )
 
         if not file_path:
@@ -123,10 +428,19 @@ class CSVChunkFilterApp(QWidget):
             if not columns:
                 raise ValueError("No columns found in CSV file.")
 
+            self.sample_df = sample_df
+
             self.column_combo.clear()
             self.column_combo.addItems(columns)
             self.column_combo.setEnabled(True)
 
+            self.output_columns_list.clear()
+            for column in columns:
+                item = QListWidgetItem(str(column))
+                item.setFlags(item.flags() | Qt.ItemIsUserCheckable)
+                item.setCheckState(Qt.Checked)
+                self.output_columns_list.addItem(item)
+
             # Try to auto-select a likely datetime column
             likely_names = [
                 "datetime", "timestamp", "date_time", "date", "time",
@@ -146,26 +460,625 @@ class CSVChunkFilterApp(QWidget):
             QMessageBox.critical(self, "Error", f"Failed to read CSV header.\n\n{str(e)}")
             self.log(f"Error while loading CSV header: {e}")
 
+    def browse_windows_file(self):
+        file_path, _ = QFileDialog.getOpenFileName(
+            self,
+            "Select Time Windows File",
+            "",
+            "Window Files (*.csv *.txt *.json);;All Files (*)"
+        )
+
+        if not file_path:
+            return
+
+        try:
+            windows = load_time_windows(file_path)
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Failed to load time windows.\n\n{str(e)}")
+            return
+
+        self.windows_input.setPlainText(
+            "\n".join(f"{start}, {end}" for start, end in windows)
+        )
+        self.log(f"Loaded {len(windows)} time windows from: {file_path}")
+
+    def selected_resample(self):
+        resample = self.resample_combo.currentText()
+        return None if resample == "None" else resample
+
+    def selected_output_columns(self):
+        return [
+            self.output_columns_list.item(i).text()
+            for i in range(self.output_columns_list.count())
+            if self.output_columns_list.item(i).checkState() == Qt.Checked
+        ]
+
+    def detect_sorted_column(self, datetime_column):
+        if self.sample_df is None or not datetime_column:
+            return
+
+        is_sorted = looks_time_sorted(self.sample_df, datetime_column)
+        self.sorted_checkbox.setChecked(is_sorted)
+
+        if is_sorted:
+            self.log(f"Column '{datetime_column}' looks time-sorted, early exit enabled.")
+
     def get_output_file_path(self):
+        return filtered_output_path(
+            self.csv_file_path,
+            self.output_format_combo.currentText(),
+            self.selected_compression()
+        )
+
+    def run_sequential_filter(self, datetime_column, start_dt, end_dt, output_file, usecols=None):
+        def report_progress(percent, stats):
+            self.progress_bar.setValue(percent)
+            self.log(
+                f"Processed {stats['total_rows']} rows, "
+                f"matched {stats['filtered_rows']} rows so far..."
+            )
+            QApplication.processEvents()
+
+        summary = filter_csv_by_datetime(
+            self.csv_file_path,
+            output_file,
+            datetime_column,
+            start_dt,
+            end_dt,
+            output_columns=usecols,
+            use_index=False,
+            stop_early=self.sorted_checkbox.isChecked(),
+            output_format=self.output_format_combo.currentText(),
+            compression=self.selected_compression(),
+            engine=self.engine_combo.currentText(),
+            memory_budget_mb=self.memory_budget_spin.value(),
+            on_progress=report_progress,
+            on_status=self.log,
+            resample=self.selected_resample(),
+            aggregation=self.aggregation_combo.currentText()
+        )
+
+        if self.selected_resample():
+            self.log(f"Resampled into {summary['rows_written']} time buckets")
+
+        return summary["total_rows"], summary["filtered_rows"]
+
+    def run_parallel_filter(self, datetime_column, start_dt, end_dt, output_file, usecols=None):
+        """
+        Split the file into newline-aligned byte ranges, filter them in a
+        process pool and concatenate the part files in original row order.
+        """
+        columns, data_offset = read_csv_header(self.csv_file_path)
+
+        if datetime_column not in columns:
+            raise ValueError(f"Column '{datetime_column}' not found in CSV.")
+
+        workers = self.workers_spin.value()
+        pool = ByteRangePool(
+            self.csv_file_path, data_offset, workers, self.memory_budget_spin.value()
+        )
+
+        self.log(f"Parallel mode: {len(pool.ranges)} ranges on {workers} worker processes")
+
+        temp_dir = tempfile.mkdtemp(
+            prefix="chunk_filter_",
+            dir=os.path.dirname(output_file) or None
+        )
+        output_format = self.output_format_combo.currentText()
+        extension = OUTPUT_FORMATS[output_format]
+        part_paths = [
+            os.path.join(temp_dir, f"part_{i:05d}{extension}") for i in range(len(pool.ranges))
+        ]
+
+        processed_rows = 0
+        matched_rows = 0
+        unsorted_ranges = 0
+
+        range_args = [
+            (
+                self.csv_file_path, columns, start, stop, datetime_column,
+                start_dt, end_dt, pool.worker_budget_mb, part_path,
+                self.sorted_checkbox.isChecked(), usecols, output_format,
+                self.engine_combo.currentText()
+            )
+            for (start, stop), part_path in zip(pool.ranges, part_paths)
+        ]
+
+        try:
+            for finished in pool.run(filter_byte_range, range_args):
+                for _, (range_rows, range_matched, range_in_order) in finished:
+                    unsorted_ranges += not range_in_order
+                    processed_rows += range_rows
+                    matched_rows += range_matched
+
+                    self.progress_bar.setValue(pool.percent())
+                    self.log(
+                        f"Processed {processed_rows} rows, matched {matched_rows} rows so far..."
+                    )
+
+                QApplication.processEvents()
+
+            if unsorted_ranges:
+                self.log(
+                    f"Warning: '{datetime_column}' is out of order in {unsorted_ranges} "
+                    "ranges, early exit was disabled for them."
+                )
+
+            if matched_rows > 0:
+                writer = open_chunk_writer(output_file, output_format, self.selected_compression())
+
+                try:
+                    for part_path in part_paths:
+                        if os.path.exists(part_path):
+                            writer.append_part(part_path)
+                finally:
+                    writer.close()
+
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+        return processed_rows, matched_rows
+
+    def get_windows_output_dir(self):
         input_dir = os.path.dirname(self.csv_file_path)
-        input_name = os.path.splitext(os.path.basename(self.csv_file_path))[0]
+        input_name = strip_data_extensions(os.path.basename(self.csv_file_path))
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        output_name = f"{input_name}_filtered_{timestamp}.csv"
-        return os.path.join(input_dir, output_name)
+        return os.path.join(input_dir, f"{input_name}_windows_{timestamp}")
+
+    def run_multi_window_filter(self, datetime_column, windows, output_dir, usecols=None):
+        """
+        Single pass over the CSV that routes each row to the output file of
+        every window containing it, with the selected engine and, when
+        parallel mode is on, over byte ranges in a process pool.
+        """
+        output_format = self.output_format_combo.currentText()
+        compression = self.selected_compression()
+        extension = output_extension(output_format, compression)
+        output_files = [
+            os.path.join(
+                output_dir,
+                f"window_{i + 1:03d}_{start:%Y%m%d_%H%M%S}_{end:%Y%m%d_%H%M%S}{extension}"
+            )
+            for i, (start, end) in enumerate(windows)
+        ]
+
+        def open_window_writer(window):
+            os.makedirs(output_dir, exist_ok=True)
+            return open_chunk_writer(output_files[window], output_format, compression)
+
+        parallel = self.parallel_checkbox.isChecked()
 
-    def estimate_total_rows(self, file_path):
+        if parallel and input_compression(self.csv_file_path):
+            self.log("Compressed input cannot be split into byte ranges, filtering sequentially.")
+            parallel = False
+
+        if parallel:
+            return self.run_parallel_windows(
+                datetime_column, windows, open_window_writer, usecols
+            )
+
+        with ProgressFile(self.csv_file_path) as source:
+            def report_progress(processed_rows, window_rows):
+                self.progress_bar.setValue(source.percent())
+                self.log(
+                    f"Processed {processed_rows} rows, matched {sum(window_rows)} window rows so far..."
+                )
+                QApplication.processEvents()
+
+            processed_rows, window_rows, in_order = route_windows_into(
+                source.handle,
+                None,
+                datetime_column,
+                windows,
+                self.memory_budget_spin.value(),
+                open_window_writer,
+                self.sorted_checkbox.isChecked(),
+                usecols,
+                self.engine_combo.currentText(),
+                on_chunk=report_progress
+            )
+
+        if not in_order:
+            self.log(
+                f"Warning: '{datetime_column}' is out of order, early exit was disabled; "
+                "the whole file was read."
+            )
+
+        return processed_rows, window_rows
+
+    def run_parallel_windows(self, datetime_column, windows, open_window_writer, usecols=None):
         """
-        Rough row count for progress bar.
-        Counts lines in file and subtracts 1 for header.
+        Multi-window pass over byte ranges in a process pool. Each range
+        writes one part file per window, and every window's parts are then
+        concatenated in original row order.
         """
+        columns, data_offset = read_csv_header(self.csv_file_path)
+
+        if datetime_column not in columns:
+            raise ValueError(f"Column '{datetime_column}' not found in CSV.")
+
+        workers = self.workers_spin.value()
+        pool = ByteRangePool(
+            self.csv_file_path, data_offset, workers, self.memory_budget_spin.value()
+        )
+
+        self.log(f"Parallel mode: {len(pool.ranges)} ranges on {workers} worker processes")
+
+        temp_dir = tempfile.mkdtemp(
+            prefix="chunk_windows_",
+            dir=os.path.dirname(self.csv_file_path) or None
+        )
+        output_format = self.output_format_combo.currentText()
+        extension = OUTPUT_FORMATS[output_format]
+        part_paths = [
+            [
+                os.path.join(temp_dir, f"part_{i:05d}_{window:03d}{extension}")
+                for window in range(len(windows))
+            ]
+            for i in range(len(pool.ranges))
+        ]
+
+        processed_rows = 0
+        window_rows = [0] * len(windows)
+        unsorted_ranges = 0
+
+        range_args = [
+            (
+                self.csv_file_path, columns, start, stop, datetime_column, windows,
+                pool.worker_budget_mb, range_part_paths, self.sorted_checkbox.isChecked(),
+                usecols, output_format, self.engine_combo.currentText()
+            )
+            for (start, stop), range_part_paths in zip(pool.ranges, part_paths)
+        ]
+
         try:
-            with open(file_path, "r", encoding="utf-8", errors="ignore") as f:
-                total_lines = sum(1 for _ in f)
-            return max(total_lines - 1, 0)
-        except Exception:
-            return 0
+            for finished in pool.run(route_byte_range, range_args):
+                for _, (range_rows, range_window_rows, range_in_order) in finished:
+                    unsorted_ranges += not range_in_order
+                    processed_rows += range_rows
+                    window_rows = [a + b for a, b in zip(window_rows, range_window_rows)]
+
+                    self.progress_bar.setValue(pool.percent())
+                    self.log(
+                        f"Processed {processed_rows} rows, matched {sum(window_rows)} window rows so far..."
+                    )
+
+                QApplication.processEvents()
+
+            if unsorted_ranges:
+                self.log(
+                    f"Warning: '{datetime_column}' is out of order in {unsorted_ranges} "
+                    "ranges, early exit was disabled for them."
+                )
+
+            for window, rows in enumerate(window_rows):
+                if rows == 0:
+                    continue
+
+                writer = open_window_writer(window)
+
+                try:
+                    for range_part_paths in part_paths:
+                        if os.path.exists(range_part_paths[window]):
+                            writer.append_part(range_part_paths[window])
+                finally:
+                    writer.close()
+
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+        return processed_rows, window_rows
+
+    def generate_multi_window_csv(self, datetime_column, windows, usecols=None):
+        output_dir = self.get_windows_output_dir()
+
+        self.log(f"Multi-window filtering started on column: {datetime_column}")
+        self.log(f"Windows: {len(windows)}")
+        self.log(f"Output folder: {output_dir}")
+
+        try:
+            self.progress_bar.setValue(0)
+
+            processed_rows, window_rows = self.run_multi_window_filter(
+                datetime_column, windows, output_dir, usecols
+            )
+
+            self.progress_bar.setValue(100)
+
+            for i, rows in enumerate(window_rows):
+                start, end = windows[i]
+                self.log(f"Window {i + 1} ({start} - {end}): {rows} rows")
+
+            if sum(window_rows) == 0:
+                self.log("No rows matched any of the time windows.")
+                QMessageBox.information(
+                    self,
+                    "Done",
+                    "No matching rows found for the time windows."
+                )
+            else:
+                matched_windows = sum(1 for rows in window_rows if rows > 0)
+                self.log(f"Filtering completed. Windows with rows: {matched_windows}")
+                QMessageBox.information(
+                    self,
+                    "Success",
+                    f"Filtered files created successfully.\n\nFolder: {output_dir}\n"
+                    f"Windows with rows: {matched_windows} of {len(windows)}"
+                )
+
+        except Exception as e:
+            self.log(f"Error during filtering: {e}")
+            QMessageBox.critical(self, "Error", f"Failed to generate filtered CSVs.\n\n{str(e)}")
+
+    def start_following(self, datetime_column, start_dt, end_dt, usecols=None):
+        if self.output_format_combo.currentText() != "CSV":
+            QMessageBox.warning(self, "Warning", "Follow mode appends to the output and needs CSV output.")
+            return
+
+        if input_compression(self.csv_file_path):
+            QMessageBox.warning(self, "Warning", "Follow mode needs an uncompressed CSV input.")
+            return
+
+        compression = self.selected_compression()
+        output_file = follow_output_path(self.csv_file_path, compression)
+
+        self.follow_request = {
+            "csv_path": self.csv_file_path,
+            "output_path": output_file,
+            "datetime_column": datetime_column,
+            "start_dt": start_dt,
+            "end_dt": end_dt,
+            "output_columns": usecols,
+            "compression": compression,
+            "engine": self.engine_combo.currentText(),
+            "memory_budget_mb": self.memory_budget_spin.value(),
+        }
+
+        self.log(f"Following {self.csv_file_path} into {output_file}")
+        self.generate_button.setText("Stop Following")
+
+        self.refresh_follow()
+
+        if self.follow_request is not None:
+            self.follow_timer.start(self.follow_interval_spin.value() * 1000)
+
+    def refresh_follow(self):
+        try:
+            summary = follow_csv_by_datetime(**self.follow_request, on_status=self.log)
+        except Exception as e:
+            self.stop_following()
+            self.log(f"Error during follow refresh: {e}")
+            QMessageBox.critical(self, "Error", f"Follow mode stopped.\n\n{str(e)}")
+            return
+
+        self.progress_bar.setValue(100)
+        self.log(
+            f"Refresh: {summary['total_rows']} new rows read, "
+            f"{summary['filtered_rows']} matching rows appended"
+        )
+
+    def stop_following(self):
+        self.follow_timer.stop()
+        self.follow_request = None
+        self.generate_button.setText("Generate New CSV")
+        self.log("Follow mode stopped.")
+
+    def generate_partitioned_csv(self, datetime_column, start_dt, end_dt, partition_by, usecols=None):
+        output_dir = partitions_output_dir(self.csv_file_path)
+
+        self.log(f"Partitioned filtering started on column: {datetime_column}")
+        self.log(f"Start datetime: {start_dt}")
+        self.log(f"End datetime: {end_dt}")
+        self.log(f"Partition by: {partition_by}")
+        self.log(f"Output folder: {output_dir}")
+
+        if self.parallel_checkbox.isChecked():
+            self.log("Partitioned output is written in a single pass, filtering sequentially.")
+
+        def report_progress(percent, stats):
+            self.progress_bar.setValue(percent)
+            self.log(
+                f"Processed {stats['total_rows']} rows, "
+                f"matched {stats['filtered_rows']} rows so far..."
+            )
+            QApplication.processEvents()
+
+        try:
+            self.progress_bar.setValue(0)
+
+            summary = filter_csv_by_datetime(
+                self.csv_file_path,
+                output_dir,
+                datetime_column,
+                start_dt,
+                end_dt,
+                output_columns=usecols,
+                use_index=False,
+                stop_early=self.sorted_checkbox.isChecked(),
+                output_format=self.output_format_combo.currentText(),
+                compression=self.selected_compression(),
+                engine=self.engine_combo.currentText(),
+                memory_budget_mb=self.memory_budget_spin.value(),
+                on_progress=report_progress,
+                on_status=self.log,
+                partition_by=partition_by,
+                max_open_partitions=self.max_open_files_spin.value(),
+                resample=self.selected_resample(),
+                aggregation=self.aggregation_combo.currentText()
+            )
+
+            self.progress_bar.setValue(100)
+
+            partition_rows = summary["partition_rows"]
+
+            for label, rows in sorted(partition_rows.items()):
+                self.log(f"Partition {label}: {rows} rows")
+
+            if not partition_rows:
+                self.log("No rows matched the selected datetime range.")
+                QMessageBox.information(
+                    self,
+                    "Done",
+                    "No matching rows found for the selected datetime range."
+                )
+            else:
+                self.log(
+                    f"Filtering completed. Total matched rows: {summary['filtered_rows']} "
+                    f"in {len(partition_rows)} partitions"
+                )
+                QMessageBox.information(
+                    self,
+                    "Success",
+                    f"Partitioned files created successfully.\n\nFolder: {output_dir}\n"
+                    f"Partitions: {len(partition_rows)}\nRows: {summary['filtered_rows']}"
+                )
+
+        except Exception as e:
+            self.log(f"Error during filtering: {e}")
+            QMessageBox.critical(self, "Error", f"Failed to generate partitioned files.\n\n{str(e)}")
+
+    def sort_csv_file(self):
+        if not self.csv_file_path:
+            QMessageBox.warning(self, "Warning", "Please select a CSV file first.")
+            return
+
+        if not self.column_combo.currentText():
+            QMessageBox.warning(self, "Warning", "Please select a datetime column.")
+            return
+
+        datetime_column = self.column_combo.currentText()
+        output_file = sorted_output_path(self.csv_file_path, self.selected_compression())
+
+        self.log(f"Sorting by column: {datetime_column}")
+        self.log(f"Memory budget: {self.memory_budget_spin.value()} MB")
+        self.log(f"Output file: {output_file}")
+
+        if self.output_format_combo.currentText() != "CSV":
+            self.log("Sorted output is always written as CSV.")
+
+        def report_progress(percent, rows):
+            self.progress_bar.setValue(percent)
+            QApplication.processEvents()
+
+        try:
+            self.progress_bar.setValue(0)
+
+            summary = sort_csv_by_datetime(
+                self.csv_file_path,
+                output_file,
+                datetime_column,
+                memory_budget_mb=self.memory_budget_spin.value(),
+                compression=self.selected_compression(),
+                on_progress=report_progress,
+                on_status=self.log
+            )
+
+            self.progress_bar.setValue(100)
+            self.log(
+                f"Sorting completed. Rows: {summary['total_rows']}, runs: {summary['runs']}, "
+                f"merge passes: {summary['merge_passes']}"
+            )
+            QMessageBox.information(
+                self,
+                "Success",
+                f"Sorted file created successfully.\n\nFile: {output_file}\nRows: {summary['total_rows']}"
+            )
+
+        except Exception as e:
+            self.log(f"Error during sorting: {e}")
+            QMessageBox.critical(self, "Error", f"Failed to sort CSV.\n\n{str(e)}")
+
+    def join_csv_file(self):
+        if not self.csv_file_path:
+            QMessageBox.warning(self, "Warning", "Please select a CSV file first.")
+            return
+
+        if not self.column_combo.currentText():
+            QMessageBox.warning(self, "Warning", "Please select a datetime column.")
+            return
+
+        right_path, _ = QFileDialog.getOpenFileName(
+            self,
+            "Select CSV File to Join",
+            os.path.dirname(self.csv_file_path),
+            "CSV Files (*.csv *.csv.gz *.csv.bz2 *.csv.xz);;All Files (*)"
+        )
+
+        if not right_path:
+            return
+
+        datetime_column = self.column_combo.currentText()
+
+        try:
+            right_columns, _ = read_csv_header(right_path)
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Failed to read CSV header.\n\n{str(e)}")
+            return
+
+        if datetime_column in right_columns:
+            right_column = datetime_column
+        else:
+            right_column, accepted = QInputDialog.getItem(
+                self, "Datetime Column", "Datetime column of the joined CSV:", right_columns, 0, False
+            )
+            if not accepted:
+                return
+
+        tolerance_ms = self.join_tolerance_spin.value()
+        tolerance = pd.Timedelta(milliseconds=tolerance_ms) if tolerance_ms else None
+        direction = self.join_direction_combo.currentText()
+        output_file = joined_output_path(self.csv_file_path, self.selected_compression())
+
+        self.log(f"Joining {right_path} on column: {right_column}")
+        self.log(f"Direction: {direction}, tolerance: {tolerance if tolerance is not None else 'none'}")
+        self.log(f"Memory budget: {self.memory_budget_spin.value()} MB")
+        self.log(f"Output file: {output_file}")
+
+        if self.output_format_combo.currentText() != "CSV":
+            self.log("Joined output is always written as CSV.")
+
+        def report_progress(percent, rows):
+            self.progress_bar.setValue(percent)
+            QApplication.processEvents()
+
+        try:
+            self.progress_bar.setValue(0)
+
+            summary = asof_join_csv(
+                self.csv_file_path,
+                right_path,
+                output_file,
+                datetime_column,
+                right_column,
+                tolerance=tolerance,
+                direction=direction,
+                memory_budget_mb=self.memory_budget_spin.value(),
+                compression=self.selected_compression(),
+                on_progress=report_progress,
+                on_status=self.log
+            )
+
+            self.progress_bar.setValue(100)
+            self.log(
+                f"Join completed. Rows: {summary['left_rows']}, matched: {summary['matched_rows']}, "
+                f"joined file rows read: {summary['right_rows']}"
+            )
+            QMessageBox.information(
+                self,
+                "Success",
+                f"Joined file created successfully.\n\nFile: {output_file}\n"
+                f"Rows: {summary['left_rows']}\nMatched: {summary['matched_rows']}"
+            )
+
+        except Exception as e:
+            self.log(f"Error during join: {e}")
+            QMessageBox.critical(self, "Error", f"Failed to join CSV files.\n\n{str(e)}")
 
     def generate_filtered_csv(self):
+        if self.follow_timer.isActive():
+            self.stop_following()
+            return
+
         if not self.csv_file_path:
             QMessageBox.warning(self, "Warning", "Please select a CSV file first.")
             return
@@ -174,6 +1087,31 @@ class CSVChunkFilterApp(QWidget):
             QMessageBox.warning(self, "Warning", "Please select a datetime column.")
             return
 
+        datetime_column = self.column_combo.currentText()
+        all_columns = [
+            self.output_columns_list.item(i).text()
+            for i in range(self.output_columns_list.count())
+        ]
+        usecols = projected_columns(all_columns, self.selected_output_columns(), datetime_column)
+
+        windows_text = self.windows_input.toPlainText().strip()
+        if windows_text:
+            try:
+                windows = parse_time_windows(windows_text)
+            except ValueError as e:
+                QMessageBox.warning(self, "Warning", f"Invalid time windows.\n\n{str(e)}")
+                return
+
+            if windows:
+                if self.partition_combo.currentText() != "None" or self.selected_resample():
+                    self.log(
+                        "Partitioning and resampling apply to a single datetime range, "
+                        "ignored for time windows."
+                    )
+
+                self.generate_multi_window_csv(datetime_column, windows, usecols)
+                return
+
         start_dt = self.start_datetime.dateTime().toPyDateTime()
         end_dt = self.end_datetime.dateTime().toPyDateTime()
 
@@ -181,7 +1119,22 @@ class CSVChunkFilterApp(QWidget):
             QMessageBox.warning(self, "Warning", "Start datetime must be before end datetime.")
             return
 
-        datetime_column = self.column_combo.currentText()
+        partition_by = self.partition_combo.currentText()
+
+        if self.follow_checkbox.isChecked():
+            if partition_by != "None" or self.selected_resample():
+                QMessageBox.warning(
+                    self, "Warning", "Follow mode cannot be combined with partitioning or resampling."
+                )
+                return
+
+            self.start_following(datetime_column, start_dt, end_dt, usecols)
+            return
+
+        if partition_by != "None":
+            self.generate_partitioned_csv(datetime_column, start_dt, end_dt, partition_by, usecols)
+            return
+
         output_file = self.get_output_file_path()
 
         self.log(f"Filtering started on column: {datetime_column}")
@@ -189,50 +1142,30 @@ class CSVChunkFilterApp(QWidget):
         self.log(f"End datetime: {end_dt}")
         self.log(f"Output file: {output_file}")
 
-        try:
-            total_rows = self.estimate_total_rows(self.csv_file_path)
-            processed_rows = 0
-            matched_rows = 0
-            first_write = True
+        if usecols:
+            self.log(f"Output columns: {', '.join(usecols)}")
 
+        try:
             self.progress_bar.setValue(0)
 
-            for chunk in pd.read_csv(self.csv_file_path, chunksize=self.chunk_size):
-                if datetime_column not in chunk.columns:
-                    raise ValueError(f"Column '{datetime_column}' not found in chunk.")
-
-                # Convert datetime column safely
-                chunk[datetime_column] = pd.to_datetime(
-                    chunk[datetime_column],
-                    errors="coerce"
-                )
-
-                # Filter rows between start and end datetime
-                filtered_chunk = chunk[
-                    (chunk[datetime_column] >= start_dt) &
-                    (chunk[datetime_column] <= end_dt)
-                ]
-
-                if not filtered_chunk.empty:
-                    filtered_chunk.to_csv(
-                        output_file,
-                        mode="w" if first_write else "a",
-                        index=False,
-                        header=first_write
-                    )
-                    matched_rows += len(filtered_chunk)
-                    first_write = False
+            parallel = self.parallel_checkbox.isChecked()
 
-                processed_rows += len(chunk)
+            if parallel and input_compression(self.csv_file_path):
+                self.log("Compressed input cannot be split into byte ranges, filtering sequentially.")
+                parallel = False
 
-                if total_rows > 0:
-                    progress = int((processed_rows / total_rows) * 100)
-                    self.progress_bar.setValue(min(progress, 100))
+            if parallel and self.selected_resample():
+                self.log("Time buckets are built in a single pass, filtering sequentially.")
+                parallel = False
 
-                self.log(
-                    f"Processed {processed_rows} rows, matched {matched_rows} rows so far..."
+            if parallel:
+                processed_rows, matched_rows = self.run_parallel_filter(
+                    datetime_column, start_dt, end_dt, output_file, usecols
+                )
+            else:
+                processed_rows, matched_rows = self.run_sequential_filter(
+                    datetime_column, start_dt, end_dt, output_file, usecols
                 )
-                QApplication.processEvents()
 
             self.progress_bar.setValue(100)
 
@@ -254,7 +1187,7 @@ class CSVChunkFilterApp(QWidget):
                 QMessageBox.information(
                     self,
                     "Success",
-                    f"Filtered CSV created successfully.\n\nFile: {output_file}\nRows: {matched_rows}"
+                    f"Filtered file created successfully.\n\nFile: {output_file}\nRows: {matched_rows}"
                 )
 
         except Exception as e: